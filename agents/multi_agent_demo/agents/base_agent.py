@@ -4,13 +4,15 @@
 这个模块定义了所有Agent的基础类，包含了Agent的通用功能和接口。
 """
 import asyncio
+import contextvars
+import functools
 import json
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Callable, List, Optional, Union, ClassVar
 from dataclasses import dataclass, field
 from datetime import datetime
-import requests
 
 from config.llm_config import get_llm_config
 
@@ -70,6 +72,13 @@ class BaseAgent(ABC):
     - 状态管理
     """
     
+    # 正在进行中的LLM请求: (Agent, 会话, 请求内容) -> 异步任务，用于合并相同的并发请求
+    _inflight_requests: ClassVar[Dict[str, asyncio.Task]] = {}
+    
+    # 是否把调用方的contextvars传递到线程池中的LLM调用
+    # 应用不依赖contextvars（如链路追踪）时可关闭，省去每次复制上下文的开销
+    enable_context_propagation: ClassVar[bool] = True
+    
     def __init__(self, agent_id: str, name: str, description: str):
         """
         初始化Agent
@@ -87,6 +96,10 @@ class BaseAgent(ABC):
         # 状态管理
         self.status = "idle"  # "idle", "working", "error"
         self.current_task = None
+        # 正在执行的任务数；同一Agent可能被多个工作流任务或压力测试Worker并发使用
+        self._active_tasks = 0
+        # LLM会话ID，相同会话的请求可在服务端复用提示词前缀缓存
+        self.session_id: Optional[str] = None
         self.message_history: List[Message] = []
         self.task_history: List[TaskResult] = []
         
@@ -95,6 +108,14 @@ class BaseAgent(ABC):
         self.total_execution_time = 0.0
         self.success_count = 0
         self.error_count = 0
+        # call_llm 在线程池中并发执行，统计计数的更新需要加锁
+        self._stats_lock = threading.Lock()
+        
+        # 状态变化监听器: (agent_id, 性能统计) -> None，由工作流管理器订阅以维护系统快照
+        self.stats_listener: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        
+        # 结果预览长度，任务完成时生成 content_preview 供展示使用
+        self.preview_len = 200
         
         print(f"🤖 Agent初始化完成: {self.name} ({self.agent_id})")
     
@@ -127,8 +148,9 @@ class BaseAgent(ABC):
         Returns:
             LLM的响应文本
         """
-        start_time = time.time()
-        self.total_requests += 1
+        start_time = time.perf_counter()
+        with self._stats_lock:
+            self.total_requests += 1
         
         try:
             # 构建请求数据
@@ -141,36 +163,93 @@ class BaseAgent(ABC):
             request_data.update(kwargs)
             
             # 发送请求
-            response = requests.post(
+            response = self.llm_config.get_session().post(
                 self.llm_config.get_chat_url(),
-                headers=self.llm_config.get_headers(),
+                headers=self.llm_config.get_headers(self.session_id),
                 json=request_data,
                 timeout=120  # 增加到120秒，与LLMConfig保持一致
             )
             
-            execution_time = time.time() - start_time
-            self.total_execution_time += execution_time
+            execution_time = time.perf_counter() - start_time
+            with self._stats_lock:
+                self.total_execution_time += execution_time
             
             if response.status_code == 200:
                 response_data = response.json()
                 content = response_data['choices'][0]['message']['content']
-                self.success_count += 1
+                with self._stats_lock:
+                    self.success_count += 1
                 
                 print(f"📡 {self.name} LLM调用成功 (耗时: {execution_time:.2f}s)")
                 return content
             else:
-                self.error_count += 1
+                with self._stats_lock:
+                    self.error_count += 1
                 error_msg = f"LLM API错误: {response.status_code} - {response.text}"
                 print(f"❌ {self.name} LLM调用失败: {error_msg}")
                 raise Exception(error_msg)
                 
         except Exception as e:
-            execution_time = time.time() - start_time
-            self.total_execution_time += execution_time
-            self.error_count += 1
+            execution_time = time.perf_counter() - start_time
+            with self._stats_lock:
+                self.total_execution_time += execution_time
+                self.error_count += 1
             print(f"❌ {self.name} LLM调用异常: {str(e)}")
             raise e
     
+    async def acall_llm(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        异步调用LLM
+        
+        在线程池中执行阻塞的HTTP请求，避免阻塞事件循环，使并发的
+        任务和工作流能够真正重叠执行。内容完全相同的请求同时进行时，
+        只发送一次请求，所有调用方共享同一个响应。只有同一Agent、同一会话的
+        请求才会合并，不同会话的请求头不同，统计也记在各自的Agent上。
+        
+        Args:
+            messages: 消息列表，符合OpenAI API格式
+            **kwargs: 额外的LLM参数
+            
+        Returns:
+            LLM的响应文本
+        """
+        key = json.dumps(
+            [self.agent_id, self.session_id, messages, kwargs],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        
+        inflight = BaseAgent._inflight_requests
+        request = inflight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(self._dispatch_agent_task(self.call_llm, messages, **kwargs))
+            inflight[key] = request
+            request.add_done_callback(lambda _: inflight.pop(key, None))
+        
+        # shield: 某个调用方被取消时不影响共享同一请求的其他调用方
+        return await asyncio.shield(request)
+    
+    async def _dispatch_agent_task(self, func, *args, **kwargs):
+        """
+        在默认线程池中执行阻塞函数
+        
+        与 asyncio.to_thread 相同，但当前上下文中没有任何contextvars
+        或关闭了上下文传递时，直接提交函数，不经过 Context.run。
+        
+        Args:
+            func: 要执行的阻塞函数
+            *args, **kwargs: 传给函数的参数
+            
+        Returns:
+            函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if self.enable_context_propagation:
+            ctx = contextvars.copy_context()
+            if ctx:
+                call = functools.partial(ctx.run, call)
+        return await loop.run_in_executor(None, call)
+    
     def get_agent_type(self) -> str:
         """
         获取Agent类型，用于LLM参数配置
@@ -216,27 +295,40 @@ class BaseAgent(ABC):
         这个方法包含了任务执行的通用逻辑，包括状态管理、错误处理等
         """
         task_id = task.get("id", f"task_{int(time.time())}")
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         print(f"🎯 {self.name} 开始执行任务: {task_id}")
         
+        self._active_tasks += 1
         self.status = "working"
         self.current_task = task
+        self._publish_stats()
         
         try:
             # 调用具体的任务处理逻辑
             result = await self.process_task(task)
-            result.execution_time = time.time() - start_time
+            result.execution_time = time.perf_counter() - start_time
             
-            self.status = "idle"
-            self.current_task = None
+            if isinstance(result.result, dict) and result.result.get("content"):
+                result.result["content_preview"] = self.make_preview(result.result["content"])
+            
+            self._end_task("idle")
             self.task_history.append(result)
+            self._publish_stats()
             
             print(f"✅ {self.name} 任务完成: {task_id} (耗时: {result.execution_time:.2f}s)")
             return result
             
+        except asyncio.CancelledError:
+            # 调用方超时（如 asyncio.wait_for）或取消时恢复空闲状态，不会一直停留在工作中
+            self._end_task("idle")
+            self._publish_stats()
+            
+            print(f"⏹️ {self.name} 任务被取消: {task_id}")
+            raise
+            
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_result = TaskResult(
                 agent_id=self.agent_id,
                 task_id=task_id,
@@ -246,13 +338,50 @@ class BaseAgent(ABC):
                 execution_time=execution_time
             )
             
-            self.status = "error"
-            self.current_task = None
+            self._end_task("error")
             self.task_history.append(error_result)
+            self._publish_stats()
             
             print(f"❌ {self.name} 任务失败: {task_id} - {str(e)}")
             return error_result
     
+    def _end_task(self, final_status: str):
+        """
+        任务结束时更新Agent状态
+        
+        仍有其他任务在执行时保持工作中，最后一个任务结束后才切换到最终状态。
+        
+        Args:
+            final_status: 没有其他任务在执行时的状态，"idle" 或 "error"
+        """
+        self._active_tasks -= 1
+        if self._active_tasks > 0:
+            self.status = "working"
+        else:
+            self.status = final_status
+            self.current_task = None
+    
+    def make_preview(self, content: str, preview_len: Optional[int] = None) -> str:
+        """
+        生成内容预览
+        
+        Args:
+            content: 完整内容
+            preview_len: 预览长度，默认使用 self.preview_len
+            
+        Returns:
+            截断后的预览文本，超出部分以"..."表示
+        """
+        preview_len = preview_len or self.preview_len
+        if len(content) <= preview_len:
+            return content
+        return content[:preview_len] + "..."
+    
+    def _publish_stats(self):
+        """在状态变化时把最新的性能统计推送给监听器"""
+        if self.stats_listener is not None:
+            self.stats_listener(self.agent_id, self.get_performance_stats())
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """获取性能统计信息"""
         avg_execution_time = (self.total_execution_time / self.total_requests 
@@ -304,6 +433,7 @@ class BaseAgent(ABC):
         self.current_task = None
         self.message_history.clear()
         self.task_history.clear()
+        self._publish_stats()
         
         # 保留性能统计
         print(f"🔄 {self.name} 状态已重置")
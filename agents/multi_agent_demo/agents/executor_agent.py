@@ -209,7 +209,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": execution_prompt})
         
-        execution_result = self.call_llm(context)
+        execution_result = await self.acall_llm(context)
         
         result = {
             "type": "plan_execution",
@@ -295,7 +295,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": problem_solving_prompt})
         
-        solution_result = self.call_llm(context)
+        solution_result = await self.acall_llm(context)
         
         result = {
             "type": "problem_solving",
@@ -381,7 +381,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": monitoring_prompt})
         
-        monitoring_result = self.call_llm(context)
+        monitoring_result = await self.acall_llm(context)
         
         result = {
             "type": "progress_monitoring",
@@ -468,7 +468,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": implementation_prompt})
         
-        implementation_result = self.call_llm(context)
+        implementation_result = await self.acall_llm(context)
         
         result = {
             "type": "solution_implementation",
@@ -550,7 +550,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": quality_prompt})
         
-        quality_result = self.call_llm(context)
+        quality_result = await self.acall_llm(context)
         
         result = {
             "type": "quality_check",
@@ -606,7 +606,7 @@ class ExecutorAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": general_prompt})
         
-        execution_result = self.call_llm(context)
+        execution_result = await self.acall_llm(context)
         
         result = {
             "type": "general_execution",
@@ -209,7 +209,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": planning_prompt})
         
-        plan_result = self.call_llm(context)
+        plan_result = await self.acall_llm(context)
         
         result = {
             "type": "project_plan",
@@ -286,7 +286,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": breakdown_prompt})
         
-        breakdown_result = self.call_llm(context)
+        breakdown_result = await self.acall_llm(context)
         
         result = {
             "type": "task_breakdown",
@@ -364,7 +364,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": resource_prompt})
         
-        resource_result = self.call_llm(context)
+        resource_result = await self.acall_llm(context)
         
         result = {
             "type": "resource_planning",
@@ -444,7 +444,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": risk_prompt})
         
-        risk_result = self.call_llm(context)
+        risk_result = await self.acall_llm(context)
         
         result = {
             "type": "risk_assessment",
@@ -516,7 +516,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": schedule_prompt})
         
-        schedule_result = self.call_llm(context)
+        schedule_result = await self.acall_llm(context)
         
         result = {
             "type": "schedule_optimization",
@@ -566,7 +566,7 @@ class PlannerAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": general_prompt})
         
-        planning_result = self.call_llm(context)
+        planning_result = await self.acall_llm(context)
         
         result = {
             "type": "general_planning",
@@ -177,7 +177,7 @@ class ResearcherAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": research_prompt})
         
-        research_result = self.call_llm(context)
+        research_result = await self.acall_llm(context)
         
         # 构建结构化结果
         result = {
@@ -255,7 +255,7 @@ class ResearcherAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": analysis_prompt})
         
-        analysis_result = self.call_llm(context)
+        analysis_result = await self.acall_llm(context)
         
         result = {
             "type": "data_analysis",
@@ -328,7 +328,7 @@ class ResearcherAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": review_prompt})
         
-        review_result = self.call_llm(context)
+        review_result = await self.acall_llm(context)
         
         result = {
             "type": "literature_review",
@@ -393,7 +393,7 @@ class ResearcherAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": checking_prompt})
         
-        checking_result = self.call_llm(context)
+        checking_result = await self.acall_llm(context)
         
         result = {
             "type": "fact_checking",
@@ -441,7 +441,7 @@ class ResearcherAgent(BaseAgent):
         context = self.get_conversation_context()
         context.append({"role": "user", "content": general_prompt})
         
-        research_result = self.call_llm(context)
+        research_result = await self.acall_llm(context)
         
         result = {
             "type": "general_research",
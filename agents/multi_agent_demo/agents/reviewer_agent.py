@@ -213,7 +213,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": quality_review_prompt})
         
-        review_result = self.call_llm(context_messages)
+        review_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "quality_review",
@@ -308,7 +308,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": content_review_prompt})
         
-        review_result = self.call_llm(context_messages)
+        review_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "content_review",
@@ -403,7 +403,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": process_review_prompt})
         
-        review_result = self.call_llm(context_messages)
+        review_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "process_review",
@@ -495,7 +495,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": compliance_prompt})
         
-        compliance_result = self.call_llm(context_messages)
+        compliance_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "compliance_check",
@@ -591,7 +591,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": assessment_prompt})
         
-        assessment_result = self.call_llm(context_messages)
+        assessment_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "final_assessment",
@@ -640,7 +640,7 @@ class ReviewerAgent(BaseAgent):
         context_messages = self.get_conversation_context()
         context_messages.append({"role": "user", "content": general_prompt})
         
-        review_result = self.call_llm(context_messages)
+        review_result = await self.acall_llm(context_messages)
         
         result = {
             "type": "general_review",
@@ -4,8 +4,9 @@ LLM配置模块
 这个模块包含了与大语言模型相关的所有配置信息，
 包括API端点、模型参数等。基于test_api.py的配置。
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 # LLM服务配置 - 基于您的test_api.py文件
@@ -21,6 +22,9 @@ DEFAULT_LLM_PARAMS = {
     "presence_penalty": 0.0
 }
 
+# HTTP连接池大小，需不小于同时进行的LLM请求数
+HTTP_POOL_MAXSIZE = 32
+
 # 不同Agent角色的专用参数 - 优化后降低复杂度
 AGENT_SPECIFIC_PARAMS = {
     "researcher": {
@@ -48,16 +52,46 @@ class LLMConfig:
         self.base_url = LLM_BASE_URL
         self.model_name = LLM_MODEL_NAME
         self.default_params = DEFAULT_LLM_PARAMS.copy()
+        self._session: Optional[requests.Session] = None
+        
+    def get_session(self) -> requests.Session:
+        """
+        获取共享的HTTP会话
         
+        所有LLM请求复用同一个连接池，避免每次请求重新建立TCP连接。
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+    
+    def close_session(self):
+        """关闭共享的HTTP会话"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
     def get_chat_url(self) -> str:
         """获取聊天API的完整URL"""
         return f"{self.base_url}/chat/completions"
     
-    def get_headers(self) -> Dict[str, str]:
-        """获取请求头"""
-        return {
+    def get_headers(self, session_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        获取请求头
+        
+        Args:
+            session_id: 会话ID，设置后附加 X-Session-Id 请求头，
+                        便于服务端将同一会话路由到同一实例以复用前缀缓存
+        """
+        headers = {
             "Content-Type": "application/json"
         }
+        if session_id:
+            headers["X-Session-Id"] = session_id
+        return headers
     
     def get_params_for_agent(self, agent_type: str) -> Dict[str, Any]:
         """
@@ -105,7 +139,7 @@ class LLMConfig:
                 {"role": "user", "content": "Hello, this is a connection test."}
             ])
             
-            response = requests.post(
+            response = self.get_session().post(
                 self.get_chat_url(),
                 headers=self.get_headers(),
                 json=test_data,
@@ -135,7 +169,7 @@ class LLMConfig:
             # 合并额外参数
             request_data.update(kwargs)
             
-            response = requests.post(
+            response = self.get_session().post(
                 self.get_chat_url(),
                 headers=self.get_headers(),
                 json=request_data,
@@ -15,12 +15,14 @@ import sys
 import os
 import time
 import json
+import logging
+import traceback
 from typing import Dict, Any, List
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from workflows import MultiAgentWorkflow
+from workflows import MultiAgentWorkflow, configure_logging, run_async
 from config import test_llm_connection
 import random
 
@@ -559,7 +561,7 @@ class AdvancedDemo:
         print_section("系统整体状态")
         
         # 获取系统总览
-        system_overview = self.workflow_manager.get_system_overview()
+        system_overview = await self.workflow_manager.get_system_overview()
         coordinator_status = system_overview['coordinator_status']
         
         print(f"🎛️ 协调器状态: {coordinator_status}")
@@ -727,8 +729,8 @@ async def main():
         print("\n👋 演示被用户中断")
     except Exception as e:
         print(f"\n❌ 演示执行异常: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        traceback.print_exception(type(e), e, e.__traceback__, limit=5, chain=False)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    configure_logging(logging.INFO)
+    run_async(main())
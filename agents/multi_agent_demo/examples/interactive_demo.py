@@ -11,25 +11,135 @@
 适合希望深度探索系统功能的开发者。
 """
 import asyncio
+import hashlib
 import sys
 import os
 import json
+import logging
+import math
 import time
+import traceback
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 
+try:
+    import orjson  # 可选依赖，序列化大结果时比标准库json更快
+except ImportError:
+    orjson = None
+
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from workflows import MultiAgentWorkflow
+from workflows import MultiAgentWorkflow, configure_logging, run_async
 from config import test_llm_connection
 
+# 自定义工作流结果缓存的有效期（秒）
+WORKFLOW_CACHE_MAX_AGE = 3600
+
+# 并发测试中所有工作流共用的需求（元组，下游不可修改）
+CONCURRENT_TEST_REQUIREMENTS = ("快速完成", "基础质量")
+
+# 压力测试进度输出: 每累计多少条或间隔多少秒输出一次
+STRESS_PROGRESS_BATCH = 50
+STRESS_PROGRESS_INTERVAL = 2.0
+
+# 任务字典的常用键，所有任务共享同一个字符串对象
+_ID, _TYPE, _DATA = sys.intern("id"), sys.intern("type"), sys.intern("data")
+
+def dumps_pretty(obj: Any) -> str:
+    """
+    将对象序列化为缩进2格、保留中文的JSON字符串
+    
+    安装了orjson时使用orjson，否则退回到标准库json。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+# 帮助页面文本，导入时构建一次，显示时一次性写出
+_HELP_TEXT = """\
+🎯 LangChain 0.3 多Agent协作系统使用指南
+
+📖 核心概念:
+   • Agent: 智能代理，具有特定的职责和能力
+   • Workflow: 工作流，定义多个Agent的协作流程
+   • Task: 任务，Agent执行的具体工作单元
+   • Coordinator: 协调器，管理Agent和工作流的执行
+
+🤖 可用的Agent:
+   • 研究员 (Researcher): 信息收集、分析和整理
+   • 规划师 (Planner): 计划制定、任务分解和资源配置
+   • 执行者 (Executor): 任务执行、问题解决和结果交付
+   • 审查员 (Reviewer): 质量评估、错误检测和改进建议
+
+📋 预定义工作流:
+   • 文档撰写: 研究 + 规划(并行) → 执行 → 审查
+   • 项目规划: 需求分析 → 计划制定 + 风险评估(并行) → 审查
+   • 问题解决: 问题分析 → 方案规划 → 实施 → 验证
+   • 质量改进: 现状评估 → 根因分析 → 改进规划 → 实施 → 验证
+   • 研究分析: 数据收集 + 文献综述(并行) → 报告规划 → 撰写 → 评议
+
+🔧 系统配置:
+   • LLM服务: DeepSeek-V3-0324-HSW
+   • 服务地址: http://127.0.0.1:6000/v1
+   • 配置文件: config/llm_config.py
+
+📁 项目结构:
+   • agents/: Agent实现
+   • workflows/: 工作流管理
+   • config/: 配置文件
+   • examples/: 示例程序
+   • docs/: 详细文档
+
+💡 使用建议:
+   1. 从简单的预定义工作流开始
+   2. 理解每个Agent的能力和特点
+   3. 尝试创建自定义工作流
+   4. 利用性能测试优化系统
+   5. 阅读详细文档深入学习
+
+🔗 相关文档:
+   • docs/tutorial.md - 详细教程
+   • docs/concepts.md - 核心概念
+   • docs/best_practices.md - 最佳实践
+   • README.md - 项目说明
+"""
+
+@dataclass(slots=True)
+class TaskDef:
+    """性能测试中使用的轻量任务定义"""
+    id: str
+    type: str
+    data: Dict[str, Any]
+    agent_id: str = ""
+    dependencies: List[str] = field(default_factory=list)
+    priority: int = 5
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 Agent.execute_task 接受的字典格式"""
+        return {_ID: self.id, _TYPE: self.type, _DATA: self.data}
+
 class InteractiveDemo:
     """交互式演示类"""
     
+    __slots__ = (
+        "workflow_manager",
+        "running",
+        "current_workflows",
+        "_workflow_cache",
+        "_agent_ids",
+        "_agent_info",
+    )
+    
     def __init__(self):
         self.workflow_manager = None
         self.running = True
         self.current_workflows = {}
+        # 自定义工作流结果缓存: 缓存键 -> {"workflow": ..., "cached_at": ...}
+        self._workflow_cache: Dict[str, Dict[str, Any]] = {}
+        # Agent列表缓存，注册新Agent后需调用 invalidate_agent_cache()
+        self._agent_ids: Optional[tuple] = None
+        self._agent_info: Optional[Dict[str, Any]] = None
         
     async def initialize(self):
         """初始化系统"""
@@ -37,6 +147,23 @@ class InteractiveDemo:
         self.workflow_manager = MultiAgentWorkflow()
         print("✅ 系统初始化完成")
     
+    def agent_ids(self) -> tuple:
+        """获取可用Agent ID列表（缓存）"""
+        if self._agent_ids is None:
+            self._agent_ids = tuple(self.workflow_manager.coordinator.agents.keys())
+        return self._agent_ids
+    
+    def agent_info(self) -> Dict[str, Any]:
+        """获取Agent ID到Agent实例的映射（缓存）"""
+        if self._agent_info is None:
+            self._agent_info = dict(self.workflow_manager.coordinator.agents)
+        return self._agent_info
+    
+    def invalidate_agent_cache(self):
+        """Agent注册信息变化后清除缓存"""
+        self._agent_ids = None
+        self._agent_info = None
+    
     def print_header(self, title: str):
         """打印标题"""
         print("\n" + "="*60)
@@ -75,6 +202,41 @@ class InteractiveDemo:
                 print("\n👋 操作被用户取消")
                 return None
     
+    def _get_positive_input(self, prompt: str, input_type: type, default: Any):
+        """获取大于0的数值输入，输入0或负数时提示并重新输入；用户取消时返回None"""
+        while True:
+            value = self.get_user_input(prompt, input_type, default)
+            if value is None or value > 0:
+                return value
+            print("❌ 请输入大于0的数值")
+    
+    def _get_menu_choice(self, prompt: str, n_options: int, default: Optional[int] = None) -> Optional[int]:
+        """
+        获取菜单选项编号
+        
+        只接受 0 到 n_options 之间的整数，无效输入时提示并重新输入。
+        
+        Returns:
+            选项编号，用户取消时返回None
+        """
+        while True:
+            try:
+                user_input = input(prompt).strip()
+            except KeyboardInterrupt:
+                print("\n👋 操作被用户取消")
+                return None
+            
+            if not user_input and default is not None:
+                return default
+            
+            # isdecimal 只接受 int() 能解析的十进制数字，"²"、"①" 等字符不会通过
+            if user_input.isdecimal():
+                value = int(user_input)
+                if value <= n_options:
+                    return value
+            
+            print(f"❌ 无效的选择，请输入 0-{n_options}")
+    
     async def main_menu(self):
         """主菜单"""
         while self.running:
@@ -93,7 +255,7 @@ class InteractiveDemo:
             
             self.print_menu("主菜单", options)
             
-            choice = self.get_user_input("请选择操作 (0-8): ", int)
+            choice = self._get_menu_choice("请选择操作 (0-8): ", len(options))
             
             if choice is None:  # 用户取消
                 break
@@ -117,8 +279,6 @@ class InteractiveDemo:
             elif choice == 8:
                 print("👋 感谢使用多Agent协作系统！")
                 self.running = False
-            else:
-                print("❌ 无效的选择，请重新输入")
     
     async def run_predefined_workflow_menu(self):
         """预定义工作流菜单"""
@@ -140,9 +300,9 @@ class InteractiveDemo:
             print(f"   🤖 参与Agent: {', '.join(desc['agents'])}")
             print(f"   🔄 执行阶段: {' → '.join(desc['stages'])}")
         
-        choice = self.get_user_input(f"\n请选择工作流模板 (1-{len(templates)}): ", int)
+        choice = self._get_menu_choice(f"\n请选择工作流模板 (1-{len(templates)}): ", len(templates))
         
-        if choice and 1 <= choice <= len(templates):
+        if choice:
             template_name = templates[choice - 1]
             await self.run_selected_template(template_name, template_descriptions[template_name])
     
@@ -208,7 +368,7 @@ class InteractiveDemo:
         # 确认执行
         print(f"\n📊 即将执行工作流:")
         print(f"   模板: {template_info['name']}")
-        print(f"   输入参数: {json.dumps(input_data, ensure_ascii=False, indent=2)}")
+        print(f"   输入参数: {dumps_pretty(input_data)}")
         
         confirm = self.get_user_input("确认执行? (y/n): ", bool, True)
         if not confirm:
@@ -295,11 +455,8 @@ class InteractiveDemo:
         print("现在请定义工作流中的任务...")
         
         # 获取可用Agent
-        agents = list(self.workflow_manager.coordinator.agents.keys())
-        agent_info = {
-            agent_id: self.workflow_manager.coordinator.agents[agent_id]
-            for agent_id in agents
-        }
+        agents = self.agent_ids()
+        agent_info = self.agent_info()
         
         print(f"\n🤖 可用的Agent:")
         for i, agent_id in enumerate(agents, 1):
@@ -316,8 +473,8 @@ class InteractiveDemo:
             task_id = self.get_user_input(f"任务ID (默认: task_{task_counter}): ", default=f"task_{task_counter}")
             
             # 选择Agent
-            agent_choice = self.get_user_input(f"选择执行Agent (1-{len(agents)}): ", int)
-            if not agent_choice or not (1 <= agent_choice <= len(agents)):
+            agent_choice = self._get_menu_choice(f"选择执行Agent (1-{len(agents)}): ", len(agents))
+            if not agent_choice:
                 print("❌ 无效的Agent选择")
                 continue
             
@@ -342,8 +499,8 @@ class InteractiveDemo:
             for i, task_type in enumerate(supported_tasks, 1):
                 print(f"   {i}. {task_type}")
             
-            task_type_choice = self.get_user_input(f"选择任务类型 (1-{len(supported_tasks)}): ", int)
-            if not task_type_choice or not (1 <= task_type_choice <= len(supported_tasks)):
+            task_type_choice = self._get_menu_choice(f"选择任务类型 (1-{len(supported_tasks)}): ", len(supported_tasks))
+            if not task_type_choice:
                 print("❌ 无效的任务类型选择")
                 continue
             
@@ -410,6 +567,15 @@ class InteractiveDemo:
             print("❌ 工作流创建已取消")
             return
         
+        # 相同的工作流定义直接复用缓存结果
+        cache_key = self._workflow_cache_key(workflow_name, tasks)
+        cached = self._workflow_cache.get(cache_key)
+        if cached and time.time() - cached["cached_at"] < WORKFLOW_CACHE_MAX_AGE:
+            result_workflow = cached["workflow"]
+            print(f"♻️ 命中缓存，复用工作流结果: {result_workflow.workflow_id}")
+            await self.show_workflow_results(result_workflow.workflow_id)
+            return
+        
         # 创建并执行工作流
         try:
             workflow = await self.workflow_manager.create_custom_workflow(workflow_name, tasks)
@@ -429,6 +595,16 @@ class InteractiveDemo:
                 "template_name": "custom",
                 "execution_time": execution_time
             }
+            # 只缓存全部任务都成功的结果，避免临时故障（如LLM服务中断）在缓存有效期内被反复复用
+            all_succeeded = result_workflow.failed_count == 0 and all(
+                task.status == "completed" and task.result is not None and task.result.status == "success"
+                for task in result_workflow.tasks
+            )
+            if all_succeeded:
+                self._workflow_cache[cache_key] = {
+                    "workflow": result_workflow,
+                    "cached_at": time.time()
+                }
             
             print(f"✅ 自定义工作流执行完成！耗时: {execution_time:.2f}秒")
             
@@ -438,15 +614,20 @@ class InteractiveDemo:
         except Exception as e:
             print(f"❌ 自定义工作流执行失败: {str(e)}")
     
+    def _workflow_cache_key(self, workflow_name: str, tasks: List[Dict[str, Any]]) -> str:
+        """计算自定义工作流的缓存键（与任务定义顺序无关）"""
+        payload = json.dumps(
+            [workflow_name, sorted(json.dumps(t, sort_keys=True, ensure_ascii=False) for t in tasks)],
+            ensure_ascii=False
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
     async def explore_agent_capabilities_menu(self):
         """探索Agent能力菜单"""
         self.print_header("🤖 探索Agent能力")
         
-        agents = list(self.workflow_manager.coordinator.agents.keys())
-        agent_info = {
-            agent_id: self.workflow_manager.coordinator.agents[agent_id]
-            for agent_id in agents
-        }
+        agents = self.agent_ids()
+        agent_info = self.agent_info()
         
         print("🤖 可用的Agent:")
         for i, agent_id in enumerate(agents, 1):
@@ -455,9 +636,9 @@ class InteractiveDemo:
             print(f"      📝 {agent.description}")
             print(f"      📊 状态: {agent.status}")
         
-        choice = self.get_user_input(f"\n选择要探索的Agent (1-{len(agents)}): ", int)
+        choice = self._get_menu_choice(f"\n选择要探索的Agent (1-{len(agents)}): ", len(agents))
         
-        if choice and 1 <= choice <= len(agents):
+        if choice:
             agent_id = agents[choice - 1]
             await self.explore_single_agent(agent_id, agent_info[agent_id])
     
@@ -517,9 +698,9 @@ class InteractiveDemo:
         for i, task_type in enumerate(supported_tasks, 1):
             print(f"   {i}. {task_type}")
         
-        choice = self.get_user_input(f"选择任务类型 (1-{len(supported_tasks)}): ", int)
+        choice = self._get_menu_choice(f"选择任务类型 (1-{len(supported_tasks)}): ", len(supported_tasks))
         
-        if not choice or not (1 <= choice <= len(supported_tasks)):
+        if not choice:
             print("❌ 无效的选择")
             return
         
@@ -611,7 +792,7 @@ class InteractiveDemo:
         self.print_header("📊 系统状态")
         
         # 获取系统总览
-        system_overview = self.workflow_manager.get_system_overview()
+        system_overview = await self.workflow_manager.get_system_overview()
         coordinator_status = system_overview['coordinator_status']
         
         print(f"🎛️ 协调器状态:")
@@ -662,9 +843,9 @@ class InteractiveDemo:
             print(f"      状态: {workflow.status.value}")
             print(f"      执行时间: {workflow_info['execution_time']:.2f}秒")
         
-        choice = self.get_user_input(f"\n选择要查看的工作流 (1-{len(workflow_list)}): ", int)
+        choice = self._get_menu_choice(f"\n选择要查看的工作流 (1-{len(workflow_list)}): ", len(workflow_list))
         
-        if choice and 1 <= choice <= len(workflow_list):
+        if choice:
             workflow_id, _ = workflow_list[choice - 1]
             await self.show_workflow_results(workflow_id)
     
@@ -690,9 +871,8 @@ class InteractiveDemo:
             print(f"   执行时间: {task_result['execution_time']:.2f}秒")
             
             if task_result['status'] == 'success' and task_result['result']:
-                content = task_result['result'].get('content', '')
-                if content:
-                    preview = content[:200] + "..." if len(content) > 200 else content
+                preview = task_result['result'].get('content_preview')
+                if preview:
                     print(f"   结果预览: {preview}")
             
             if task_result.get('error_message'):
@@ -704,7 +884,7 @@ class InteractiveDemo:
         print("   2. 导出结果到文件")
         print("   3. 返回")
         
-        option = self.get_user_input("选择操作 (1-3): ", int)
+        option = self._get_menu_choice("选择操作 (1-3): ", 3)
         
         if option == 1:
             await self.show_full_results(results)
@@ -738,7 +918,7 @@ class InteractiveDemo:
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+                f.write(dumps_pretty(results))
             
             print(f"✅ 结果已导出到: {filename}")
             
@@ -754,7 +934,7 @@ class InteractiveDemo:
         print("   2. 工作流并发测试")
         print("   3. 系统压力测试")
         
-        choice = self.get_user_input("选择测试类型 (1-3): ", int)
+        choice = self._get_menu_choice("选择测试类型 (1-3): ", 3)
         
         if choice == 1:
             await self.single_agent_performance_test()
@@ -768,19 +948,20 @@ class InteractiveDemo:
         print("\n🔍 单Agent性能测试")
         
         # 选择Agent
-        agents = list(self.workflow_manager.coordinator.agents.keys())
+        agents = self.agent_ids()
+        agent_info = self.agent_info()
         print("选择要测试的Agent:")
         for i, agent_id in enumerate(agents, 1):
-            agent = self.workflow_manager.coordinator.agents[agent_id]
+            agent = agent_info[agent_id]
             print(f"   {i}. {agent.name}")
         
-        choice = self.get_user_input(f"选择Agent (1-{len(agents)}): ", int)
-        if not choice or not (1 <= choice <= len(agents)):
+        choice = self._get_menu_choice(f"选择Agent (1-{len(agents)}): ", len(agents))
+        if not choice:
             print("❌ 无效选择")
             return
         
         agent_id = agents[choice - 1]
-        agent = self.workflow_manager.coordinator.agents[agent_id]
+        agent = agent_info[agent_id]
         
         # 测试参数
         test_count = self.get_user_input("测试次数 (默认5): ", int, 5)
@@ -788,88 +969,102 @@ class InteractiveDemo:
         print(f"\n🚀 开始测试 {agent.name}，执行 {test_count} 次任务...")
         
         # 执行测试
-        results = []
+        clock = asyncio.get_running_loop().time
+        successful_tests = 0
+        total_time = 0.0
+        fastest = math.inf
+        slowest = -math.inf
         for i in range(test_count):
             print(f"执行第 {i+1} 次测试...")
             
-            start_time = time.time()
+            start_time = clock()
             try:
-                task_def = {
-                    "id": f"perf_test_{i+1}",
-                    "type": "research_topic",
-                    "data": {
+                task_def = TaskDef(
+                    id=f"perf_test_{i+1}",
+                    type="research_topic",
+                    data={
                         "topic": f"测试主题 {i+1}",
                         "scope": "基础",
                         "depth": "入门"
-                    }
-                }
-                
-                result = await agent.execute_task(task_def)
-                end_time = time.time()
+                    },
+                    agent_id=agent_id
+                )
                 
-                results.append({
-                    "success": result.status == "success",
-                    "time": end_time - start_time
-                })
+                result = await agent.execute_task(task_def.to_dict())
+                successful_tests += result.status == "success"
                 
-            except Exception as e:
-                end_time = time.time()
-                results.append({
-                    "success": False,
-                    "time": end_time - start_time,
-                    "error": str(e)
-                })
+            except Exception:
+                pass
+            
+            # 单次遍历累计统计，无需保存每次结果
+            elapsed = clock() - start_time
+            total_time += elapsed
+            fastest = min(fastest, elapsed)
+            slowest = max(slowest, elapsed)
         
         # 统计结果
-        successful_tests = sum(1 for r in results if r["success"])
-        total_time = sum(r["time"] for r in results)
-        avg_time = total_time / len(results)
+        inv_n = 1.0 / test_count
+        avg_time = total_time * inv_n
         
         print(f"\n📊 性能测试结果:")
         print(f"   总测试次数: {test_count}")
         print(f"   成功次数: {successful_tests}")
-        print(f"   成功率: {successful_tests/test_count*100:.1f}%")
+        print(f"   成功率: {successful_tests * 100.0 * inv_n:.1f}%")
         print(f"   总耗时: {total_time:.2f}秒")
         print(f"   平均耗时: {avg_time:.2f}秒/次")
-        print(f"   最快: {min(r['time'] for r in results):.2f}秒")
-        print(f"   最慢: {max(r['time'] for r in results):.2f}秒")
+        print(f"   最快: {fastest:.2f}秒")
+        print(f"   最慢: {slowest:.2f}秒")
     
     async def workflow_concurrent_test(self):
         """工作流并发测试"""
         print("\n🔄 工作流并发测试")
         
         concurrent_count = self.get_user_input("并发工作流数量 (默认3): ", int, 3)
+        workflow_timeout = self.get_user_input("单个工作流超时时间(秒, 默认600): ", float, 600.0)
         
         print(f"🚀 启动 {concurrent_count} 个并发工作流...")
         
-        # 创建并发任务
-        tasks = []
-        for i in range(concurrent_count):
-            task_input = {
-                "topic": f"并发测试主题 {i+1}",
-                "requirements": ["快速完成", "基础质量"]
-            }
-            
-            task = asyncio.create_task(
+        clock = asyncio.get_running_loop().time
+        start_time = clock()
+        successful_workflows = 0
+        timed_out_workflows = 0
+        errors = []
+        
+        # 按完成顺序输出结果，不必等待所有工作流结束；
+        # 每个工作流单独限时，卡住的工作流不会拖住整个测试
+        for finished in asyncio.as_completed([
+            asyncio.wait_for(
                 self.workflow_manager.execute_template_workflow(
-                    "document_creation", task_input
-                )
+                    "document_creation",
+                    {"topic": f"并发测试主题 {i+1}", "requirements": CONCURRENT_TEST_REQUIREMENTS}
+                ),
+                timeout=workflow_timeout
             )
-            tasks.append(task)
-        
-        start_time = time.time()
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        end_time = time.time()
+            for i in range(concurrent_count)
+        ]):
+            try:
+                workflow = await finished
+                successful_workflows += 1
+                print(f"✅ 工作流完成: {workflow.name} ({clock() - start_time:.2f}秒)")
+            except asyncio.TimeoutError:
+                timed_out_workflows += 1
+                print(f"⏰ 工作流超时 ({clock() - start_time:.2f}秒)")
+            except Exception as e:
+                errors.append(e)
+                print(f"❌ 工作流失败: {str(e)} ({clock() - start_time:.2f}秒)")
         
+        end_time = clock()
         total_time = end_time - start_time
-        successful_workflows = sum(1 for r in results if not isinstance(r, Exception))
+        inv_n = 1.0 / concurrent_count
         
         print(f"\n📊 并发测试结果:")
         print(f"   并发数量: {concurrent_count}")
         print(f"   成功数量: {successful_workflows}")
-        print(f"   成功率: {successful_workflows/concurrent_count*100:.1f}%")
+        print(f"   失败数量: {len(errors)}")
+        print(f"   超时数量: {timed_out_workflows}")
+        print(f"   成功率: {successful_workflows * 100.0 * inv_n:.1f}%")
         print(f"   总耗时: {total_time:.2f}秒")
-        print(f"   平均每个工作流: {total_time/concurrent_count:.2f}秒")
+        print(f"   平均每个工作流: {total_time * inv_n:.2f}秒")
     
     async def system_stress_test(self):
         """系统压力测试"""
@@ -882,105 +1077,131 @@ class InteractiveDemo:
             print("❌ 压力测试已取消")
             return
         
-        stress_duration = self.get_user_input("测试持续时间(秒, 默认30): ", int, 30)
+        stress_duration = self._get_positive_input("测试持续时间(秒, 默认30): ", int, 30)
+        max_parallel = self._get_positive_input("并发Worker数量 (默认4): ", int, 4)
+        task_timeout = self._get_positive_input("单个任务超时时间(秒, 默认30): ", float, 30.0)
         
-        print(f"🚀 开始压力测试，持续 {stress_duration} 秒...")
+        if stress_duration is None or max_parallel is None or task_timeout is None:
+            print("❌ 压力测试已取消")
+            return
         
-        start_time = time.time()
+        print(f"🚀 开始压力测试，持续 {stress_duration} 秒，{max_parallel} 个并发Worker...")
+        
+        # 使用事件循环的单调时钟，不受系统时间调整影响
+        clock = asyncio.get_running_loop().time
+        start_time = clock()
         task_counter = 0
+        completed_tasks = 0
         successful_tasks = 0
+        timed_out_tasks = 0
+        total_latency = 0.0
+        
+        # 进度信息先缓存，批量输出
+        progress_buffer: List[str] = []
+        last_flush = start_time
+        
+        def flush_progress():
+            nonlocal last_flush
+            if progress_buffer:
+                print("\n".join(progress_buffer), flush=True)
+                progress_buffer.clear()
+            last_flush = clock()
+        
+        # 使用研究员进行压力测试
+        agent_id = "researcher_001"
+        agent = self.workflow_manager.coordinator.agents[agent_id]
+        execute = agent.execute_task
         
-        while time.time() - start_time < stress_duration:
-            try:
+        # 所有压力测试请求使用同一会话，系统提示词保持不变，
+        # 主题只出现在用户消息中，使服务端可以复用前缀缓存
+        previous_session_id = agent.session_id
+        agent.session_id = "stress_test"
+        
+        async def worker():
+            # 计数器只在事件循环线程中修改，且修改之间没有await，无需加锁
+            nonlocal task_counter, completed_tasks, successful_tasks, timed_out_tasks, total_latency
+            
+            # 测试时长由外层 asyncio.wait 的超时控制，到时取消Worker
+            while True:
                 task_counter += 1
-                
-                # 随机选择Agent和任务类型
-                agent_id = "researcher_001"  # 使用研究员进行压力测试
-                agent = self.workflow_manager.coordinator.agents[agent_id]
+                task_no = task_counter
                 
                 task_def = {
-                    "id": f"stress_test_{task_counter}",
+                    "id": f"stress_test_{task_no}",
                     "type": "research_topic",
                     "data": {
-                        "topic": f"压力测试主题 {task_counter}",
+                        "topic": f"压力测试主题 {task_no}",
                         "scope": "基础",
                         "depth": "入门"
                     }
                 }
                 
-                result = await agent.execute_task(task_def)
-                
-                if result.status == "success":
-                    successful_tasks += 1
+                task_start = clock()
+                try:
+                    result = await asyncio.wait_for(execute(task_def), timeout=task_timeout)
+                    
+                    completed_tasks += 1
+                    if result.status == "success":
+                        successful_tasks += 1
+                    
+                    progress_buffer.append(
+                        f"完成任务 {task_no}, 成功率: {successful_tasks * 100.0 / completed_tasks:.1f}%"
+                    )
+                    
+                except asyncio.TimeoutError:
+                    timed_out_tasks += 1
+                    progress_buffer.append(f"任务 {task_no} 超时")
+                    
+                except asyncio.CancelledError:
+                    # 测试结束时未完成的任务不计入统计
+                    task_counter -= 1
+                    raise
+                    
+                except Exception as e:
+                    progress_buffer.append(f"任务 {task_no} 失败: {str(e)}")
                 
-                print(f"完成任务 {task_counter}, 成功率: {successful_tasks/task_counter*100:.1f}%")
+                now = clock()
+                total_latency += now - task_start
                 
-            except Exception as e:
-                print(f"任务 {task_counter} 失败: {str(e)}")
-            
-            # 短暂休息避免过载
-            await asyncio.sleep(0.1)
+                if (len(progress_buffer) >= STRESS_PROGRESS_BATCH or
+                        now - last_flush >= STRESS_PROGRESS_INTERVAL):
+                    flush_progress()
         
-        end_time = time.time()
+        workers = [asyncio.create_task(worker()) for _ in range(max_parallel)]
+        try:
+            _, pending = await asyncio.wait(workers, timeout=stress_duration)
+            for w in pending:
+                w.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            agent.session_id = previous_session_id
+        flush_progress()
+        
+        end_time = clock()
         actual_duration = end_time - start_time
         
         print(f"\n📊 压力测试结果:")
         print(f"   测试时长: {actual_duration:.2f}秒")
         print(f"   总任务数: {task_counter}")
+        
+        # LLM响应时间不短于测试时长时，测试结束前可能没有任何任务结束
+        if task_counter == 0:
+            print("   ⚠️ 测试时间内没有任务完成，无法计算成功率、吞吐量和平均响应时间")
+            return
+        
+        inv_n = 1.0 / task_counter
         print(f"   成功任务数: {successful_tasks}")
-        print(f"   成功率: {successful_tasks/task_counter*100:.1f}%")
+        print(f"   超时任务数: {timed_out_tasks}")
+        print(f"   成功率: {successful_tasks * 100.0 * inv_n:.1f}%")
         print(f"   任务吞吐量: {task_counter/actual_duration:.2f} 任务/秒")
-        print(f"   平均响应时间: {actual_duration/task_counter:.2f}秒/任务")
+        print(f"   平均响应时间: {total_latency * inv_n:.2f}秒/任务")
     
     def show_help_and_docs(self):
         """显示帮助和文档"""
         self.print_header("📚 帮助和文档")
         
-        print("🎯 LangChain 0.3 多Agent协作系统使用指南")
-        print()
-        print("📖 核心概念:")
-        print("   • Agent: 智能代理，具有特定的职责和能力")
-        print("   • Workflow: 工作流，定义多个Agent的协作流程")
-        print("   • Task: 任务，Agent执行的具体工作单元")
-        print("   • Coordinator: 协调器，管理Agent和工作流的执行")
-        print()
-        print("🤖 可用的Agent:")
-        print("   • 研究员 (Researcher): 信息收集、分析和整理")
-        print("   • 规划师 (Planner): 计划制定、任务分解和资源配置")
-        print("   • 执行者 (Executor): 任务执行、问题解决和结果交付")
-        print("   • 审查员 (Reviewer): 质量评估、错误检测和改进建议")
-        print()
-        print("📋 预定义工作流:")
-        print("   • 文档撰写: 研究 → 规划 → 执行 → 审查")
-        print("   • 项目规划: 需求分析 → 计划制定 → 风险评估 → 审查")
-        print("   • 问题解决: 问题分析 → 方案规划 → 实施 → 验证")
-        print("   • 质量改进: 现状评估 → 根因分析 → 改进规划 → 实施 → 验证")
-        print("   • 研究分析: 数据收集 → 文献综述 → 报告规划 → 撰写 → 评议")
-        print()
-        print("🔧 系统配置:")
-        print("   • LLM服务: DeepSeek-V3-0324-HSW")
-        print("   • 服务地址: http://127.0.0.1:6000/v1")
-        print("   • 配置文件: config/llm_config.py")
-        print()
-        print("📁 项目结构:")
-        print("   • agents/: Agent实现")
-        print("   • workflows/: 工作流管理")
-        print("   • config/: 配置文件")
-        print("   • examples/: 示例程序")
-        print("   • docs/: 详细文档")
-        print()
-        print("💡 使用建议:")
-        print("   1. 从简单的预定义工作流开始")
-        print("   2. 理解每个Agent的能力和特点")
-        print("   3. 尝试创建自定义工作流")
-        print("   4. 利用性能测试优化系统")
-        print("   5. 阅读详细文档深入学习")
-        print()
-        print("🔗 相关文档:")
-        print("   • docs/tutorial.md - 详细教程")
-        print("   • docs/concepts.md - 核心概念")
-        print("   • docs/best_practices.md - 最佳实践")
-        print("   • README.md - 项目说明")
+        sys.stdout.write(_HELP_TEXT)
+
 
 async def main():
     """主函数"""
@@ -1004,8 +1225,8 @@ async def main():
         print("\n👋 感谢使用LangChain 0.3 多Agent协作系统！")
     except Exception as e:
         print(f"\n❌ 系统错误: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        traceback.print_exception(type(e), e, e.__traceback__, limit=5, chain=False)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    configure_logging(logging.INFO)
+    run_async(main())
@@ -6,16 +6,42 @@
 
 适合初学者理解多Agent系统的基本概念和工作原理。
 """
-import asyncio
 import sys
 import os
+import logging
+import traceback
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from workflows import MultiAgentWorkflow
-from config import test_llm_connection
-import json
+from workflows import MultiAgentWorkflow, configure_logging, run_async
+from config import test_llm_connection, llm_config
+
+# 演示之间共享的工作流管理器，避免重复初始化Agent
+_WORKFLOW_SINGLETON = None
+
+def get_workflow() -> MultiAgentWorkflow:
+    """获取共享的多Agent工作流管理器"""
+    global _WORKFLOW_SINGLETON
+    if _WORKFLOW_SINGLETON is None:
+        _WORKFLOW_SINGLETON = MultiAgentWorkflow()
+    return _WORKFLOW_SINGLETON
+
+def run_profiled(main):
+    """
+    在cProfile下运行异步入口函数，结束后按累计耗时输出前30项
+    
+    设置环境变量 DEMO_PROFILE=1 时启用，用于定位耗时最多的环节。
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run_async, main)
+    finally:
+        print_separator("性能分析")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
 
 def print_separator(title: str = ""):
     """打印分隔线"""
@@ -27,22 +53,28 @@ def print_separator(title: str = ""):
 
 def print_task_result(task_result: dict):
     """打印任务结果"""
-    print(f"🎯 任务ID: {task_result['task_id']}")
-    print(f"📋 执行Agent: {task_result['agent_id']}")
-    print(f"✅ 状态: {task_result['status']}")
-    print(f"⏱️ 执行时间: {task_result['execution_time']:.2f}秒")
+    # 失败的任务可能缺少部分字段，统一使用默认值
+    status = task_result.get('status', 'unknown')
+    lines = [
+        f"🎯 任务ID: {task_result.get('task_id', '?')}",
+        f"📋 执行Agent: {task_result.get('agent_id', '?')}",
+        f"✅ 状态: {status}",
+        f"⏱️ 执行时间: {task_result.get('execution_time', 0.0):.2f}秒",
+    ]
     
-    if task_result['status'] == 'success' and task_result['result']:
-        result_content = task_result['result'].get('content', '')
-        if result_content:
-            # 截取前200个字符作为预览
-            preview = result_content[:200] + "..." if len(result_content) > 200 else result_content
-            print(f"📄 结果预览: {preview}")
+    result = task_result.get('result')
+    if status == 'success' and result:
+        # Agent在任务完成时已生成预览
+        preview = result.get('content_preview')
+        if preview:
+            lines.append(f"📄 结果预览: {preview}")
     
-    if task_result.get('error_message'):
-        print(f"❌ 错误信息: {task_result['error_message']}")
+    error_message = task_result.get('error_message')
+    if error_message:
+        lines.append(f"❌ 错误信息: {error_message}")
     
-    print("-" * 40)
+    lines.append("-" * 40)
+    print("\n".join(lines))
 
 async def simple_document_creation_demo():
     """
@@ -58,11 +90,11 @@ async def simple_document_creation_demo():
     
     print("📋 演示场景: 协作撰写 'LangChain 入门指南' 技术文档")
     print("🤖 参与Agent: 研究员小R、规划师小P、执行者小E、审查员小V")
-    print("🔄 工作流程: 研究 → 规划 → 执行 → 审查")
+    print("🔄 工作流程: 研究 + 规划(并行) → 执行 → 审查")
     
     # 初始化多Agent工作流
     print("\n🔧 正在初始化多Agent工作流...")
-    workflow_manager = MultiAgentWorkflow()
+    workflow_manager = get_workflow()
     
     # 定义任务输入 - 简化版本以减少处理时间
     task_input = {
@@ -157,7 +189,7 @@ async def simple_document_creation_demo():
             print("  5. 质量控制 - 通过审查确保输出质量")
             
             print("\n🔧 系统统计信息:")
-            system_overview = workflow_manager.get_system_overview()
+            system_overview = await workflow_manager.get_system_overview()
             for agent_id, agent_info in system_overview['available_agents'].items():
                 stats = agent_info['performance']
                 print(f"  {agent_info['name']}: {stats['success_count']}次成功调用, "
@@ -194,7 +226,7 @@ async def test_agent_capabilities():
     """
     print_separator("🧪 Agent能力测试")
     
-    workflow_manager = MultiAgentWorkflow()
+    workflow_manager = get_workflow()
     
     # 测试研究员
     print("🔍 测试研究员Agent...")
@@ -215,8 +247,8 @@ async def test_agent_capabilities():
         print(f"❌ 研究员测试失败: {e}")
     
     print("📋 各Agent能力说明:")
-    agents = workflow_manager.coordinator.agents
-    for agent_id, agent in agents.items():
+    agents = workflow_manager.coordinator.agents.values()
+    for agent in agents:
         print(f"  {agent.name}: {agent.description}")
 
 def main():
@@ -246,8 +278,9 @@ def main():
     
     # 运行演示
     try:
-        # 运行文档创建演示
-        success = asyncio.run(simple_document_creation_demo())
+        # 运行文档创建演示（设置 DEMO_PROFILE 时启用性能分析）
+        runner = run_profiled if os.getenv("DEMO_PROFILE") else run_async
+        success = runner(simple_document_creation_demo())
         
         if success:
             print("\n🎓 下一步学习建议:")
@@ -270,8 +303,10 @@ def main():
         print("🔧 建议:")
         print("  1. 运行 python test_llm_performance.py 诊断问题")
         print("  2. 检查config/llm_config.py配置")
-        import traceback
-        traceback.print_exc()
+        traceback.print_exception(type(e), e, e.__traceback__, limit=5, chain=False)
+    finally:
+        llm_config.close_session()
 
 if __name__ == "__main__":
+    configure_logging(logging.INFO)
     main()
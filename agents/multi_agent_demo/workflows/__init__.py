@@ -2,9 +2,9 @@
 工作流模块初始化文件
 """
 from .task_coordinator import TaskCoordinator, WorkflowTask, Workflow, WorkflowStatus
-from .multi_agent_workflow import MultiAgentWorkflow
+from .multi_agent_workflow import MultiAgentWorkflow, TaskSpec, configure_logging, run_async
 
 __all__ = [
     'TaskCoordinator', 'WorkflowTask', 'Workflow', 'WorkflowStatus',
-    'MultiAgentWorkflow'
+    'MultiAgentWorkflow', 'TaskSpec', 'configure_logging', 'run_async'
 ]
@@ -7,15 +7,499 @@
 2. 并行工作流 - 任务并行执行
 3. 协作工作流 - Agent协作完成复杂任务
 4. 评审工作流 - 包含评审和反馈环节
+
+安装了uvloop时，入口函数通过 run_async 运行在uvloop事件循环上；
+创建 MultiAgentWorkflow 时也会调用 install_fast_loop 将uvloop设为
+默认事件循环策略，使之后新建的事件循环同样使用uvloop。
 """
 import asyncio
+import atexit
+import copy
+import hashlib
+import inspect
+import itertools
 import json
-from typing import Dict, Any, List, Optional
+import logging
+import queue
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping, Optional, Coroutine, Tuple, Union
+
+try:
+    import uvloop  # 可选依赖，提供更快的事件循环
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson  # 可选依赖，序列化输入数据时比标准库json更快
+except ImportError:
+    orjson = None
 
 from agents import ResearcherAgent, PlannerAgent, ExecutorAgent, ReviewerAgent
 from .task_coordinator import TaskCoordinator, WorkflowTask, Workflow
 
+logger = logging.getLogger(__name__)
+
+# 后台输出日志的监听器，首次调用 configure_logging 时创建
+_log_listener: Optional[QueueListener] = None
+
+# 模板中使用的Agent ID和任务类型，驻留为全局唯一的字符串对象
+_AGENTS = {
+    role: sys.intern(f"{role}_001")
+    for role in ("researcher", "planner", "executor", "reviewer")
+}
+_TASK_TYPES = {
+    name: sys.intern(name)
+    for name in (
+        "research_topic",
+        "create_project_plan",
+        "execute_plan",
+        "quality_review",
+        "analyze_data",
+        "risk_assessment",
+        "process_review",
+        "fact_checking",
+        "general_planning",
+        "implement_solution",
+        "quality_check",
+        "final_assessment",
+        "literature_review",
+        "break_down_task",
+        "general_execution",
+        "content_review",
+    )
+}
+
+# 工作流ID序号：以导入时的纳秒时间戳为起点单调递增，
+# 同一秒内创建多个工作流也不会冲突
+_WF_COUNTER = itertools.count(time.time_ns())
+
+# 模板工作流缓存的最大条目数，超出后淘汰最久未使用的条目
+TEMPLATE_CACHE_SIZE = 128
+
+# 工作流结果缓存的最大条目数，超出后淘汰最久未使用的条目
+RESULTS_CACHE_SIZE = 128
+
+# 自定义工作流任务数超过该值时，在线程中构建任务，避免阻塞事件循环
+CUSTOM_BUILD_THREAD_THRESHOLD = 32
+
+# 预定义模板的描述信息（只读，所有调用共享）
+_TEMPLATE_DESCRIPTIONS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "document_creation": MappingProxyType({
+        "name": "文档撰写工作流",
+        "description": "多Agent协作完成文档撰写，包括研究、规划、执行、审查四个阶段",
+        "agents": ["研究员", "规划师", "执行者", "审查员"],
+        "stages": ["主题研究", "撰写规划", "文档执行", "质量审查"],
+        "input_required": ["topic", "requirements"],
+        "output": "高质量的文档内容及评审报告"
+    }),
+    "project_planning": MappingProxyType({
+        "name": "项目规划工作流", 
+        "description": "全面的项目规划流程，需求分析后并行进行计划制定和风险评估，最后审查",
+        "agents": ["研究员", "规划师", "审查员"],
+        "stages": ["需求研究", "计划制定", "风险评估", "计划审查"],
+        "input_required": ["project_name", "objectives", "constraints"],
+        "output": "完整的项目计划和风险评估报告"
+    }),
+    "problem_solving": MappingProxyType({
+        "name": "问题解决工作流",
+        "description": "系统性的问题解决流程，从分析到实施再到验证",
+        "agents": ["研究员", "规划师", "执行者", "审查员"],
+        "stages": ["问题分析", "方案规划", "方案实施", "效果验证"],
+        "input_required": ["problem", "context"],
+        "output": "问题解决方案及实施验证报告"
+    }),
+    "quality_improvement": MappingProxyType({
+        "name": "质量改进工作流",
+        "description": "全面的质量改进流程，包括评估、分析、改进和验证",
+        "agents": ["审查员", "研究员", "规划师", "执行者"],
+        "stages": ["现状评估", "根因分析", "改进规划", "措施实施", "效果验证"],
+        "input_required": ["target", "current_state"],
+        "output": "质量改进方案及效果评估报告"
+    }),
+    "research_analysis": MappingProxyType({
+        "name": "研究分析工作流",
+        "description": "学术研究和分析流程，并行进行数据收集和文献综述，再撰写报告并评议",
+        "agents": ["研究员", "规划师", "执行者", "审查员"],
+        "stages": ["数据收集", "文献综述", "报告规划", "报告撰写", "同行评议"],
+        "input_required": ["topic", "scope"],
+        "output": "研究分析报告及同行评议结果"
+    }),
+})
+
+_MISSING_TEMPLATE: Mapping[str, Any] = MappingProxyType({"error": "模板不存在"})
+
+@dataclass(slots=True, frozen=True)
+class TaskSpec:
+    """自定义工作流中的任务定义"""
+    type: str
+    agent_id: str
+    data: Dict[str, Any]
+    id: Optional[str] = None
+    dependencies: Tuple[str, ...] = ()
+    priority: int = 5
+    timeout: int = 300
+    bypass_cache: bool = False
+    
+    @classmethod
+    def from_dict(cls, task_def: Dict[str, Any]) -> "TaskSpec":
+        """
+        从字典格式的任务定义创建TaskSpec
+        
+        Args:
+            task_def: 包含type, agent_id, data及可选id, dependencies,
+                priority, timeout, bypass_cache的字典
+            
+        Returns:
+            任务定义
+        """
+        return cls(
+            type=task_def["type"],
+            agent_id=task_def["agent_id"],
+            data=task_def["data"],
+            id=task_def.get("id"),
+            dependencies=tuple(task_def.get("dependencies", ())),
+            priority=task_def.get("priority", 5),
+            timeout=task_def.get("timeout", 300),
+            bypass_cache=task_def.get("bypass_cache", False)
+        )
+
+@dataclass(slots=True, frozen=True)
+class TaskBlueprint:
+    """
+    模板任务蓝图
+    
+    data_template 中的字符串可以包含 {字段名} 占位符，实例化时替换为输入值；
+    整个字符串恰好是一个占位符时直接使用原始值（列表、字典等保持原类型）。
+    """
+    id_suffix: str
+    type: str
+    agent: str
+    data_template: Dict[str, Any]
+    dep_suffixes: Tuple[str, ...] = ()
+    priority: int = 5
+
+@dataclass(slots=True, frozen=True)
+class TemplateBlueprint:
+    """
+    模板工作流蓝图：任务图结构在注册时构建一次，创建工作流时只替换输入字段
+    
+    fields 为 (占位符, 输入键, 默认值) 三元组；derived 为 (占位符, 函数) 二元组，
+    函数接收已解析的字段和原始输入，返回派生值。
+    """
+    prefix: str
+    name_fmt: str
+    description: str
+    announce: str
+    fields: Tuple[Tuple[str, str, Any], ...]
+    tasks: Tuple[TaskBlueprint, ...]
+    derived: Tuple[Tuple[str, Callable[[Dict[str, Any], Dict[str, Any]], Any]], ...] = ()
+
+def _substitute(template: Any, values: Dict[str, Any]) -> Any:
+    """按蓝图规则将模板中的占位符替换为字段值"""
+    if isinstance(template, str):
+        if "{" not in template:
+            return template
+        if template[0] == "{" and template[-1] == "}" and template[1:-1] in values:
+            return values[template[1:-1]]
+        return template.format_map(values)
+    if isinstance(template, dict):
+        return {key: _substitute(value, values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_substitute(item, values) for item in template]
+    return template
+
+def _dumps(obj: Any) -> str:
+    """
+    将对象序列化为保留中文的紧凑JSON字符串，安装了orjson时优先使用orjson
+    
+    标准库退路使用与orjson相同的紧凑分隔符，两种实现输出完全一致，
+    生成的提示词和结果缓存指纹不受是否安装orjson影响。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+async def _maybe_await(value: Any) -> Any:
+    """如果是可等待对象则等待其结果，否则原样返回"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+# 预定义模板的任务图蓝图，新增模板只需在此添加一项
+_TEMPLATE_SPECS: Mapping[str, TemplateBlueprint] = MappingProxyType({
+    # 文档撰写：研究 + 规划（并行） -> 执行 -> 审查
+    # 撰写规划只依赖主题和需求，不需要等待研究完成
+    "document_creation": TemplateBlueprint(
+        prefix="doc_creation",
+        name_fmt="文档撰写: {topic}",
+        description="多Agent协作完成文档撰写任务",
+        announce="📝 创建文档撰写工作流: {topic}",
+        fields=(
+            ("topic", "topic", "未指定主题"),
+            ("requirements", "requirements", []),
+        ),
+        tasks=(
+            # 1. 研究阶段
+            TaskBlueprint("research", _TASK_TYPES["research_topic"], _AGENTS["researcher"], {
+                "topic": "{topic}",
+                "scope": "全面",
+                "depth": "详细"
+            }, priority=8),
+            # 2. 规划阶段（与研究阶段并行）
+            TaskBlueprint("planning", _TASK_TYPES["create_project_plan"], _AGENTS["planner"], {
+                "project_name": "文档撰写: {topic}",
+                "objectives": ["撰写关于{topic}的高质量文档"],
+                "requirements": "{requirements}",
+                "timeline": "1-2天"
+            }, priority=7),
+            # 3. 执行阶段
+            TaskBlueprint("execution", _TASK_TYPES["execute_plan"], _AGENTS["executor"], {
+                "plan": "基于研究结果和规划方案撰写文档",
+                "priority": "高",
+                "deadline": "按计划完成"
+            }, ("research", "planning"), 6),
+            # 4. 审查阶段
+            TaskBlueprint("review", _TASK_TYPES["quality_review"], _AGENTS["reviewer"], {
+                "content": "执行阶段的输出文档",
+                "standards": ["准确性", "完整性", "可读性", "逻辑性"],
+                "scope": "全面审查"
+            }, ("execution",), 5),
+        )
+    ),
+    # 项目规划：研究 -> 规划 + 风险评估（并行） -> 审查
+    "project_planning": TemplateBlueprint(
+        prefix="project_planning",
+        name_fmt="项目规划: {project_name}",
+        description="多Agent协作完成项目规划",
+        announce="📊 创建项目规划工作流: {project_name}",
+        fields=(
+            ("project_name", "project_name", "未命名项目"),
+            ("objectives", "objectives", []),
+            ("constraints", "constraints", {}),
+            ("timeline", "timeline", "待定"),
+        ),
+        derived=(
+            ("serialized_input", lambda values, input_data: _dumps(input_data)),
+        ),
+        tasks=(
+            # 1. 需求研究
+            TaskBlueprint("research", _TASK_TYPES["analyze_data"], _AGENTS["researcher"], {
+                "dataset": "{serialized_input}",
+                "analysis_type": "需求分析",
+                "objectives": ["理解项目需求", "分析约束条件", "识别关键因素"]
+            }, priority=9),
+            # 2. 制定计划
+            TaskBlueprint("planning", _TASK_TYPES["create_project_plan"], _AGENTS["planner"], {
+                "project_name": "{project_name}",
+                "objectives": "{objectives}",
+                "constraints": "{constraints}",
+                "timeline": "{timeline}"
+            }, ("research",), 8),
+            # 3. 风险评估（与计划制定并行）
+            TaskBlueprint("risk_assessment", _TASK_TYPES["risk_assessment"], _AGENTS["planner"], {
+                "project_context": "项目: {project_name}",
+                "categories": ["技术风险", "资源风险", "时间风险", "质量风险"],
+                "depth": "详细"
+            }, ("research",), 7),
+            # 4. 计划审查
+            TaskBlueprint("review", _TASK_TYPES["process_review"], _AGENTS["reviewer"], {
+                "process": "项目计划和风险评估结果",
+                "standards": ["可行性", "完整性", "合理性"],
+                "efficiency": {"time": "合理", "resource": "优化"}
+            }, ("planning", "risk_assessment"), 6),
+        )
+    ),
+    # 问题解决：分析 -> 规划 -> 实施 -> 验证
+    "problem_solving": TemplateBlueprint(
+        prefix="problem_solving",
+        name_fmt="问题解决: {problem_short}...",
+        description="多Agent协作解决问题",
+        announce="🔧 创建问题解决工作流",
+        fields=(
+            ("problem", "problem", "未描述的问题"),
+            ("context", "context", {}),
+        ),
+        derived=(
+            ("problem_short", lambda values, input_data: values["problem"][:30]),
+        ),
+        tasks=(
+            # 1. 问题分析
+            TaskBlueprint("analysis", _TASK_TYPES["fact_checking"], _AGENTS["researcher"], {
+                "statements": ["{problem}"],
+                "sources": ["{context}"]
+            }, priority=9),
+            # 2. 解决方案规划
+            TaskBlueprint("solution_planning", _TASK_TYPES["general_planning"], _AGENTS["planner"], {
+                "request": "为以下问题制定解决方案: {problem}",
+                "context": "{context}"
+            }, ("analysis",), 8),
+            # 3. 方案实施
+            TaskBlueprint("implementation", _TASK_TYPES["implement_solution"], _AGENTS["executor"], {
+                "solution": "基于规划阶段的解决方案",
+                "context": "{context}",
+                "criteria": ["有效性", "可行性", "持续性"]
+            }, ("solution_planning",), 7),
+            # 4. 效果验证
+            TaskBlueprint("validation", _TASK_TYPES["quality_check"], _AGENTS["reviewer"], {
+                "deliverable": "问题解决方案及实施结果",
+                "standards": ["问题解决程度", "方案可行性", "实施质量"],
+                "scope": "全面检查"
+            }, ("implementation",), 6),
+        )
+    ),
+    # 质量改进：评估 -> 分析 -> 改进计划 -> 实施 -> 验证
+    "quality_improvement": TemplateBlueprint(
+        prefix="quality_improvement",
+        name_fmt="质量改进: {target}",
+        description="多Agent协作进行质量改进",
+        announce="📈 创建质量改进工作流: {target}",
+        fields=(
+            ("target", "target", "未指定目标"),
+            ("current_state", "current_state", {}),
+        ),
+        derived=(
+            ("serialized_state", lambda values, input_data: _dumps(values["current_state"])),
+        ),
+        tasks=(
+            # 1. 现状评估
+            TaskBlueprint("assessment", _TASK_TYPES["quality_review"], _AGENTS["reviewer"], {
+                "content": "{serialized_state}",
+                "standards": ["效率", "质量", "可靠性", "用户满意度"],
+                "scope": "深度评估"
+            }, priority=9),
+            # 2. 问题根因分析
+            TaskBlueprint("analysis", _TASK_TYPES["analyze_data"], _AGENTS["researcher"], {
+                "dataset": "质量评估结果",
+                "analysis_type": "根因分析",
+                "objectives": ["识别问题根源", "分析影响因素", "找出改进机会"]
+            }, ("assessment",), 8),
+            # 3. 改进计划制定
+            TaskBlueprint("improvement_planning", _TASK_TYPES["general_planning"], _AGENTS["planner"], {
+                "request": "制定{target}的质量改进计划",
+                "context": {"current_state": "{current_state}", "analysis_results": "根因分析结果"}
+            }, ("analysis",), 7),
+            # 4. 改进措施实施
+            TaskBlueprint("implementation", _TASK_TYPES["execute_plan"], _AGENTS["executor"], {
+                "plan": "质量改进计划",
+                "priority": "高",
+                "deadline": "按计划执行"
+            }, ("improvement_planning",), 6),
+            # 5. 改进效果验证
+            TaskBlueprint("validation", _TASK_TYPES["final_assessment"], _AGENTS["reviewer"], {
+                "deliverables": ["改进措施", "实施结果", "效果评估"],
+                "criteria": ["改进效果", "目标达成度", "可持续性"],
+                "requirements": {"improvement": "显著提升", "sustainability": "长期有效"}
+            }, ("implementation",), 5),
+        )
+    ),
+    # 研究分析：数据收集 + 文献综述（并行） -> 报告规划 -> 报告撰写 -> 同行评议
+    "research_analysis": TemplateBlueprint(
+        prefix="research_analysis",
+        name_fmt="研究分析: {topic}",
+        description="多Agent协作进行研究分析",
+        announce="🔬 创建研究分析工作流: {topic}",
+        fields=(
+            ("topic", "topic", "未指定研究主题"),
+            ("scope", "scope", "标准"),
+            ("focus_areas", "focus_areas", []),
+        ),
+        tasks=(
+            # 1. 数据收集和初步研究
+            TaskBlueprint("data_collection", _TASK_TYPES["research_topic"], _AGENTS["researcher"], {
+                "topic": "{topic}",
+                "scope": "{scope}",
+                "depth": "深入"
+            }, priority=9),
+            # 2. 文献综述（与数据收集并行）
+            TaskBlueprint("literature_review", _TASK_TYPES["literature_review"], _AGENTS["researcher"], {
+                "topic": "{topic}",
+                "timeframe": "近5年",
+                "focus_areas": "{focus_areas}"
+            }, priority=8),
+            # 3. 分析报告撰写计划
+            TaskBlueprint("report_planning", _TASK_TYPES["break_down_task"], _AGENTS["planner"], {
+                "main_task": "撰写{topic}的研究分析报告",
+                "complexity": "高",
+                "available_time": "3-5天",
+                "team_size": 1
+            }, ("data_collection", "literature_review"), 7),
+            # 4. 报告撰写
+            TaskBlueprint("report_writing", _TASK_TYPES["general_execution"], _AGENTS["executor"], {
+                "description": "基于研究结果撰写{topic}的分析报告",
+                "requirements": [
+                    "结构清晰",
+                    "论证充分",
+                    "数据可靠",
+                    "结论明确"
+                ],
+                "context": {"research_data": "前期研究结果", "literature": "文献综述"}
+            }, ("report_planning",), 6),
+            # 5. 同行评议
+            TaskBlueprint("peer_review", _TASK_TYPES["content_review"], _AGENTS["reviewer"], {
+                "content": "研究分析报告",
+                "type": "学术报告",
+                "audience": "专业研究人员",
+                "focus": ["学术严谨性", "论证逻辑", "创新性", "实用价值"]
+            }, ("report_writing",), 5),
+        )
+    ),
+})
+
+def configure_logging(level: int = logging.WARNING) -> None:
+    """
+    配置工作流包（工作流管理器和任务协调器）的日志输出
+    
+    日志默认不输出；演示程序可以设为 logging.INFO 显示工作流创建和执行过程，
+    logging.DEBUG 还会显示任务创建、进度和消息发送等细节。
+    日志记录先放入队列，由后台线程写到标准输出，事件循环不会阻塞在输出上。
+    重复调用只调整级别，不会重复添加处理器。
+    
+    Args:
+        level: 日志级别
+    """
+    global _log_listener
+    package_logger = logging.getLogger(__package__)
+    package_logger.setLevel(level)
+    if _log_listener is None:
+        log_queue = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _log_listener = QueueListener(log_queue, handler)
+        _log_listener.start()
+        # 退出时停止监听器，确保队列中剩余的日志全部输出
+        atexit.register(_log_listener.stop)
+        package_logger.addHandler(QueueHandler(log_queue))
+        package_logger.propagate = False
+
+def run_async(main: Coroutine) -> Any:
+    """
+    运行异步入口函数
+    
+    安装了uvloop时使用uvloop事件循环，否则退回到asyncio默认事件循环。
+    
+    Args:
+        main: 要运行的协程
+        
+    Returns:
+        协程的返回值
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+    
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    
+    uvloop.install()
+    return asyncio.run(main)
+
 class MultiAgentWorkflow:
     """
     多Agent工作流管理器
@@ -24,9 +508,36 @@ class MultiAgentWorkflow:
     支持多种协作模式和工作流模式。
     """
     
+    # 是否已安装uvloop事件循环策略（进程内只安装一次）
+    _fast_loop_installed = False
+    
+    @classmethod
+    def install_fast_loop(cls) -> bool:
+        """
+        将uvloop设为默认事件循环策略
+        
+        只影响之后新建的事件循环，已在运行的事件循环不受影响。
+        未安装uvloop时不做任何操作。
+        
+        Returns:
+            是否已使用uvloop事件循环策略
+        """
+        if not cls._fast_loop_installed and uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            cls._fast_loop_installed = True
+        return cls._fast_loop_installed
+    
     def __init__(self):
+        self.install_fast_loop()
         self.coordinator = TaskCoordinator()
         self.workflow_templates = {}
+        self._available_templates: Tuple[str, ...] = ()
+        # 模板工作流缓存: (模板名称, 输入摘要) -> 未执行的工作流原型
+        self._template_cache: "OrderedDict[Tuple[str, str], Workflow]" = OrderedDict()
+        # 已结束工作流的结果缓存（LRU）: 工作流ID -> (执行摘要, 结果汇总)
+        self._results_cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        # 系统快照: 由Agent在状态变化时推送更新，总览直接返回
+        self._system_snapshot: Dict[str, Any] = {"available_agents": {}}
         
         # 初始化Agent
         self._initialize_agents()
@@ -34,15 +545,15 @@ class MultiAgentWorkflow:
         # 注册工作流模板
         self._register_workflow_templates()
         
-        print("🔄 多Agent工作流管理器初始化完成")
+        logger.info("🔄 多Agent工作流管理器初始化完成")
     
     def _initialize_agents(self):
         """初始化所有Agent"""
         # 创建Agent实例
-        self.researcher = ResearcherAgent("researcher_001")
-        self.planner = PlannerAgent("planner_001") 
-        self.executor = ExecutorAgent("executor_001")
-        self.reviewer = ReviewerAgent("reviewer_001")
+        self.researcher = ResearcherAgent(_AGENTS["researcher"])
+        self.planner = PlannerAgent(_AGENTS["planner"]) 
+        self.executor = ExecutorAgent(_AGENTS["executor"])
+        self.reviewer = ReviewerAgent(_AGENTS["reviewer"])
         
         # 注册到协调器
         self.coordinator.register_agent(self.researcher)
@@ -50,19 +561,37 @@ class MultiAgentWorkflow:
         self.coordinator.register_agent(self.executor)
         self.coordinator.register_agent(self.reviewer)
         
-        print("🤖 所有Agent初始化完成")
+        # 订阅Agent状态变化，维护系统快照
+        for agent in self.coordinator.agents.values():
+            self._system_snapshot["available_agents"][agent.agent_id] = {
+                "name": agent.name,
+                "description": agent.description,
+                "status": agent.status,
+                "performance": agent.get_performance_stats()
+            }
+            agent.stats_listener = self.on_agent_stats_updated
+        
+        logger.info("🤖 所有Agent初始化完成")
+    
+    def on_agent_stats_updated(self, agent_id: str, stats: Dict[str, Any]):
+        """
+        Agent状态变化回调，更新系统快照中对应的条目
+        
+        Args:
+            agent_id: Agent ID
+            stats: Agent最新的性能统计
+        """
+        entry = self._system_snapshot["available_agents"].get(agent_id)
+        if entry is not None:
+            entry["status"] = stats["status"]
+            entry["performance"] = stats
     
     def _register_workflow_templates(self):
         """注册工作流模板"""
-        self.workflow_templates = {
-            "document_creation": self._create_document_creation_workflow,
-            "project_planning": self._create_project_planning_workflow,
-            "problem_solving": self._create_problem_solving_workflow,
-            "quality_improvement": self._create_quality_improvement_workflow,
-            "research_analysis": self._create_research_analysis_workflow
-        }
+        self.workflow_templates = {name: partial(self._build, name) for name in _TEMPLATE_SPECS}
+        self._available_templates = tuple(self.workflow_templates)
         
-        print(f"📋 注册了 {len(self.workflow_templates)} 个工作流模板")
+        logger.info("📋 注册了 %d 个工作流模板", len(self.workflow_templates))
     
     async def execute_template_workflow(self, template_name: str, input_data: Dict[str, Any]) -> Workflow:
         """
@@ -76,494 +605,258 @@ class MultiAgentWorkflow:
             执行完成的工作流
         """
         if template_name not in self.workflow_templates:
-            available_templates = list(self.workflow_templates.keys())
-            raise ValueError(f"工作流模板不存在: {template_name}。可用模板: {available_templates}")
-        
-        print(f"🚀 开始执行模板工作流: {template_name}")
-        
-        # 创建工作流
-        workflow_creator = self.workflow_templates[template_name]
-        workflow = workflow_creator(input_data)
+            raise ValueError(f"工作流模板不存在: {template_name}。可用模板: {list(self._available_templates)}")
+        
+        logger.info("🚀 开始执行模板工作流: %s", template_name)
+        
+        # 创建工作流，相同模板和输入直接复用缓存的任务图
+        cache_key = self._template_cache_key(template_name, input_data)
+        prototype = self._template_cache.get(cache_key)
+        if prototype is not None:
+            self._template_cache.move_to_end(cache_key)
+            workflow = self._instantiate_template(prototype)
+            logger.info("♻️ 复用缓存的工作流模板: %s", template_name)
+        else:
+            workflow_creator = self.workflow_templates[template_name]
+            workflow = workflow_creator(input_data)
+            self._template_cache[cache_key] = copy.deepcopy(workflow)
+            if len(self._template_cache) > TEMPLATE_CACHE_SIZE:
+                self._template_cache.popitem(last=False)
+        
+        # 同一层级内的任务互不依赖，由协调器并行调度
+        if logger.isEnabledFor(logging.DEBUG):
+            levels = self._topo_levels(workflow.tasks)
+            logger.debug("📐 执行层级: %d 层, 最大并行度 %d", len(levels), max(map(len, levels), default=0))
         
         # 执行工作流
         result_workflow = await self.coordinator.execute_workflow(workflow.workflow_id)
         
-        print(f"✅ 模板工作流执行完成: {template_name}")
+        logger.info("✅ 模板工作流执行完成: %s", template_name)
         return result_workflow
     
-    def _create_document_creation_workflow(self, input_data: Dict[str, Any]) -> Workflow:
+    @staticmethod
+    def _template_cache_key(template_name: str, input_data: Dict[str, Any]) -> Tuple[str, str]:
         """
-        创建文档撰写工作流
-        
-        流程：研究 -> 规划 -> 执行 -> 审查
+        计算模板工作流的缓存键
         
         Args:
-            input_data: 输入数据，包含topic, requirements等
+            template_name: 模板名称
+            input_data: 输入数据
             
         Returns:
-            文档创建工作流
+            (模板名称, 输入数据摘要)
         """
-        workflow_id = f"doc_creation_{int(datetime.now().timestamp())}"
-        topic = input_data.get("topic", "未指定主题")
-        requirements = input_data.get("requirements", [])
-        
-        # 创建工作流
-        workflow = self.coordinator.create_workflow(
-            workflow_id=workflow_id,
-            name=f"文档撰写: {topic}",
-            description="多Agent协作完成文档撰写任务"
-        )
-        
-        # 1. 研究阶段
-        research_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_research",
-            task_type="research_topic",
-            agent_id="researcher_001",
-            data={
-                "topic": topic,
-                "scope": "全面",
-                "depth": "详细"
-            },
-            priority=8
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, research_task)
-        
-        # 2. 规划阶段
-        planning_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_planning",
-            task_type="create_project_plan",
-            agent_id="planner_001",
-            data={
-                "project_name": f"文档撰写: {topic}",
-                "objectives": [f"撰写关于{topic}的高质量文档"],
-                "requirements": requirements,
-                "timeline": "1-2天"
-            },
-            dependencies=[f"{workflow_id}_research"],
-            priority=7
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, planning_task)
-        
-        # 3. 执行阶段
-        execution_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_execution",
-            task_type="execute_plan",
-            agent_id="executor_001",
-            data={
-                "plan": "基于研究结果和规划方案撰写文档",
-                "priority": "高",
-                "deadline": "按计划完成"
-            },
-            dependencies=[f"{workflow_id}_planning"],
-            priority=6
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, execution_task)
-        
-        # 4. 审查阶段
-        review_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_review",
-            task_type="quality_review",
-            agent_id="reviewer_001",
-            data={
-                "content": "执行阶段的输出文档",
-                "standards": ["准确性", "完整性", "可读性", "逻辑性"],
-                "scope": "全面审查"
-            },
-            dependencies=[f"{workflow_id}_execution"],
-            priority=5
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, review_task)
-        
-        print(f"📝 创建文档撰写工作流: {topic}")
-        return workflow
+        payload = json.dumps(input_data, sort_keys=True, ensure_ascii=False, default=str)
+        return template_name, hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
     
-    def _create_project_planning_workflow(self, input_data: Dict[str, Any]) -> Workflow:
+    def _instantiate_template(self, prototype: Workflow) -> Workflow:
         """
-        创建项目规划工作流
+        根据缓存的工作流原型创建新的工作流
+        
+        新工作流使用新的工作流ID，任务ID和依赖关系中的ID前缀同步替换，
+        任务数据深拷贝，执行时不会修改缓存中的原型。
         
-        流程：研究 -> 规划 -> 评估 -> 优化
+        Args:
+            prototype: 未执行过的工作流原型
+            
+        Returns:
+            已注册到协调器的新工作流
         """
-        workflow_id = f"project_planning_{int(datetime.now().timestamp())}"
-        project_name = input_data.get("project_name", "未命名项目")
-        objectives = input_data.get("objectives", [])
-        constraints = input_data.get("constraints", {})
+        old_id = prototype.workflow_id
+        new_id = f"{old_id.rsplit('_', 1)[0]}_{next(_WF_COUNTER)}"
         
-        workflow = self.coordinator.create_workflow(
-            workflow_id=workflow_id,
-            name=f"项目规划: {project_name}",
-            description="多Agent协作完成项目规划"
-        )
+        def rename(task_id: str) -> str:
+            return new_id + task_id[len(old_id):] if task_id.startswith(old_id) else task_id
         
-        # 1. 需求研究
-        research_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_research",
-            task_type="analyze_data",
-            agent_id="researcher_001",
-            data={
-                "dataset": json.dumps(input_data, ensure_ascii=False),
-                "analysis_type": "需求分析",
-                "objectives": ["理解项目需求", "分析约束条件", "识别关键因素"]
-            },
-            priority=9
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, research_task)
-        
-        # 2. 制定计划
-        planning_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_planning",
-            task_type="create_project_plan",
-            agent_id="planner_001",
-            data={
-                "project_name": project_name,
-                "objectives": objectives,
-                "constraints": constraints,
-                "timeline": input_data.get("timeline", "待定")
-            },
-            dependencies=[f"{workflow_id}_research"],
-            priority=8
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, planning_task)
-        
-        # 3. 风险评估
-        risk_assessment_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_risk_assessment",
-            task_type="risk_assessment",
-            agent_id="planner_001",
-            data={
-                "project_context": f"项目: {project_name}",
-                "categories": ["技术风险", "资源风险", "时间风险", "质量风险"],
-                "depth": "详细"
-            },
-            dependencies=[f"{workflow_id}_planning"],
-            priority=7
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, risk_assessment_task)
-        
-        # 4. 计划审查
-        review_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_review",
-            task_type="process_review",
-            agent_id="reviewer_001",
-            data={
-                "process": "项目计划和风险评估结果",
-                "standards": ["可行性", "完整性", "合理性"],
-                "efficiency": {"time": "合理", "resource": "优化"}
-            },
-            dependencies=[f"{workflow_id}_risk_assessment"],
-            priority=6
+        workflow = self.coordinator.create_workflow(
+            workflow_id=new_id,
+            name=prototype.name,
+            description=prototype.description
         )
-        self.coordinator.add_task_to_workflow(workflow_id, review_task)
+        now = datetime.now()
+        self.coordinator.add_tasks_to_workflow(new_id, [
+            replace(
+                task,
+                task_id=rename(task.task_id),
+                data=copy.deepcopy(task.data),
+                dependencies=[rename(dep) for dep in task.dependencies],
+                created_at=now
+            )
+            for task in prototype.tasks
+        ])
         
-        print(f"📊 创建项目规划工作流: {project_name}")
         return workflow
     
-    def _create_problem_solving_workflow(self, input_data: Dict[str, Any]) -> Workflow:
+    @staticmethod
+    def _topo_levels(tasks: List[WorkflowTask]) -> List[List[str]]:
         """
-        创建问题解决工作流
+        按依赖深度对工作流任务分层（Kahn算法）
         
-        流程：分析 -> 规划 -> 实施 -> 验证
-        """
-        workflow_id = f"problem_solving_{int(datetime.now().timestamp())}"
-        problem = input_data.get("problem", "未描述的问题")
-        context = input_data.get("context", {})
-        
-        workflow = self.coordinator.create_workflow(
-            workflow_id=workflow_id,
-            name=f"问题解决: {problem[:30]}...",
-            description="多Agent协作解决问题"
-        )
-        
-        # 1. 问题分析
-        analysis_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_analysis",
-            task_type="fact_checking",
-            agent_id="researcher_001",
-            data={
-                "statements": [problem],
-                "sources": [context]
-            },
-            priority=9
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, analysis_task)
-        
-        # 2. 解决方案规划
-        solution_planning_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_solution_planning",
-            task_type="general_planning",
-            agent_id="planner_001",
-            data={
-                "request": f"为以下问题制定解决方案: {problem}",
-                "context": context
-            },
-            dependencies=[f"{workflow_id}_analysis"],
-            priority=8
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, solution_planning_task)
-        
-        # 3. 方案实施
-        implementation_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_implementation",
-            task_type="implement_solution",
-            agent_id="executor_001",
-            data={
-                "solution": "基于规划阶段的解决方案",
-                "context": context,
-                "criteria": ["有效性", "可行性", "持续性"]
-            },
-            dependencies=[f"{workflow_id}_solution_planning"],
-            priority=7
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, implementation_task)
-        
-        # 4. 效果验证
-        validation_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_validation",
-            task_type="quality_check",
-            agent_id="reviewer_001",
-            data={
-                "deliverable": "问题解决方案及实施结果",
-                "standards": ["问题解决程度", "方案可行性", "实施质量"],
-                "scope": "全面检查"
-            },
-            dependencies=[f"{workflow_id}_implementation"],
-            priority=6
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, validation_task)
+        每个任务所在层级为其到根任务的最长路径长度，
+        同一层级内的任务互不依赖，可以并行执行。
         
-        print(f"🔧 创建问题解决工作流")
-        return workflow
+        Args:
+            tasks: 工作流任务列表
+            
+        Returns:
+            按层级分组的任务ID列表
+            
+        Raises:
+            ValueError: 依赖关系中存在环或引用了不存在的任务
+        """
+        remaining = {task.task_id: len(task.dependencies) for task in tasks}
+        dependents: Dict[str, List[str]] = {task_id: [] for task_id in remaining}
+        for task in tasks:
+            for dep in task.dependencies:
+                if dep not in dependents:
+                    raise ValueError(f"任务 {task.task_id} 依赖不存在的任务: {dep}")
+                dependents[dep].append(task.task_id)
+        
+        levels = []
+        current = [task_id for task_id, count in remaining.items() if count == 0]
+        while current:
+            levels.append(current)
+            next_level = []
+            for task_id in current:
+                for child in dependents[task_id]:
+                    remaining[child] -= 1
+                    if remaining[child] == 0:
+                        next_level.append(child)
+            current = next_level
+        
+        if sum(map(len, levels)) != len(remaining):
+            cyclic = [task_id for task_id, count in remaining.items() if count > 0]
+            raise ValueError(f"任务依赖中存在环: {cyclic}")
+        
+        return levels
     
-    def _create_quality_improvement_workflow(self, input_data: Dict[str, Any]) -> Workflow:
+    def _materialize(self, blueprint: TemplateBlueprint, input_data: Dict[str, Any]) -> Workflow:
         """
-        创建质量改进工作流
+        根据蓝图创建工作流
         
-        流程：评估 -> 分析 -> 改进计划 -> 实施 -> 验证
+        Args:
+            blueprint: 模板工作流蓝图
+            input_data: 输入数据
+            
+        Returns:
+            已注册到协调器的工作流
         """
-        workflow_id = f"quality_improvement_{int(datetime.now().timestamp())}"
-        target = input_data.get("target", "未指定目标")
-        current_state = input_data.get("current_state", {})
+        workflow_id = f"{blueprint.prefix}_{next(_WF_COUNTER)}"
+        
+        # 解析输入字段，默认值复制一份，避免不同工作流共享可变对象
+        values = {
+            name: input_data[key] if key in input_data else copy.copy(default)
+            for name, key, default in blueprint.fields
+        }
+        for name, derive in blueprint.derived:
+            values[name] = derive(values, input_data)
         
         workflow = self.coordinator.create_workflow(
             workflow_id=workflow_id,
-            name=f"质量改进: {target}",
-            description="多Agent协作进行质量改进"
+            name=blueprint.name_fmt.format_map(values),
+            description=blueprint.description
         )
         
-        # 1. 现状评估
-        assessment_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_assessment",
-            task_type="quality_review",
-            agent_id="reviewer_001",
-            data={
-                "content": json.dumps(current_state, ensure_ascii=False),
-                "standards": ["效率", "质量", "可靠性", "用户满意度"],
-                "scope": "深度评估"
-            },
-            priority=9
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, assessment_task)
-        
-        # 2. 问题根因分析
-        analysis_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_analysis",
-            task_type="analyze_data",
-            agent_id="researcher_001",
-            data={
-                "dataset": "质量评估结果",
-                "analysis_type": "根因分析",
-                "objectives": ["识别问题根源", "分析影响因素", "找出改进机会"]
-            },
-            dependencies=[f"{workflow_id}_assessment"],
-            priority=8
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, analysis_task)
-        
-        # 3. 改进计划制定
-        improvement_planning_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_improvement_planning",
-            task_type="general_planning",
-            agent_id="planner_001",
-            data={
-                "request": f"制定{target}的质量改进计划",
-                "context": {"current_state": current_state, "analysis_results": "根因分析结果"}
-            },
-            dependencies=[f"{workflow_id}_analysis"],
-            priority=7
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, improvement_planning_task)
-        
-        # 4. 改进措施实施
-        implementation_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_implementation",
-            task_type="execute_plan",
-            agent_id="executor_001",
-            data={
-                "plan": "质量改进计划",
-                "priority": "高",
-                "deadline": "按计划执行"
-            },
-            dependencies=[f"{workflow_id}_improvement_planning"],
-            priority=6
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, implementation_task)
-        
-        # 5. 改进效果验证
-        validation_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_validation",
-            task_type="final_assessment",
-            agent_id="reviewer_001",
-            data={
-                "deliverables": ["改进措施", "实施结果", "效果评估"],
-                "criteria": ["改进效果", "目标达成度", "可持续性"],
-                "requirements": {"improvement": "显著提升", "sustainability": "长期有效"}
-            },
-            dependencies=[f"{workflow_id}_implementation"],
-            priority=5
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, validation_task)
+        self.coordinator.add_tasks_to_workflow(workflow_id, [
+            self.coordinator.create_task(
+                task_id=f"{workflow_id}_{tb.id_suffix}",
+                task_type=tb.type,
+                agent_id=tb.agent,
+                data=_substitute(tb.data_template, values),
+                dependencies=[f"{workflow_id}_{suffix}" for suffix in tb.dep_suffixes],
+                priority=tb.priority
+            )
+            for tb in blueprint.tasks
+        ])
         
-        print(f"📈 创建质量改进工作流: {target}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(blueprint.announce.format_map(values))
         return workflow
     
-    def _create_research_analysis_workflow(self, input_data: Dict[str, Any]) -> Workflow:
+    def _build(self, name: str, input_data: Dict[str, Any]) -> Workflow:
         """
-        创建研究分析工作流
+        按名称创建预定义模板工作流
         
-        流程：数据收集 -> 深度分析 -> 报告撰写 -> 同行评议
+        Args:
+            name: 模板名称，对应 _TEMPLATE_SPECS 中的一项
+            input_data: 输入数据
+            
+        Returns:
+            已注册到协调器的工作流
         """
-        workflow_id = f"research_analysis_{int(datetime.now().timestamp())}"
-        research_topic = input_data.get("topic", "未指定研究主题")
-        research_scope = input_data.get("scope", "标准")
-        
-        workflow = self.coordinator.create_workflow(
-            workflow_id=workflow_id,
-            name=f"研究分析: {research_topic}",
-            description="多Agent协作进行研究分析"
-        )
-        
-        # 1. 数据收集和初步研究
-        data_collection_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_data_collection",
-            task_type="research_topic",
-            agent_id="researcher_001",
-            data={
-                "topic": research_topic,
-                "scope": research_scope,
-                "depth": "深入"
-            },
-            priority=9
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, data_collection_task)
-        
-        # 2. 文献综述
-        literature_review_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_literature_review",
-            task_type="literature_review",
-            agent_id="researcher_001",
-            data={
-                "topic": research_topic,
-                "timeframe": "近5年",
-                "focus_areas": input_data.get("focus_areas", [])
-            },
-            dependencies=[f"{workflow_id}_data_collection"],
-            priority=8
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, literature_review_task)
-        
-        # 3. 分析报告撰写计划
-        report_planning_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_report_planning",
-            task_type="break_down_task",
-            agent_id="planner_001",
-            data={
-                "main_task": f"撰写{research_topic}的研究分析报告",
-                "complexity": "高",
-                "available_time": "3-5天",
-                "team_size": 1
-            },
-            dependencies=[f"{workflow_id}_literature_review"],
-            priority=7
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, report_planning_task)
-        
-        # 4. 报告撰写
-        report_writing_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_report_writing",
-            task_type="general_execution",
-            agent_id="executor_001",
-            data={
-                "description": f"基于研究结果撰写{research_topic}的分析报告",
-                "requirements": [
-                    "结构清晰",
-                    "论证充分", 
-                    "数据可靠",
-                    "结论明确"
-                ],
-                "context": {"research_data": "前期研究结果", "literature": "文献综述"}
-            },
-            dependencies=[f"{workflow_id}_report_planning"],
-            priority=6
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, report_writing_task)
-        
-        # 5. 同行评议
-        peer_review_task = self.coordinator.create_task(
-            task_id=f"{workflow_id}_peer_review",
-            task_type="content_review",
-            agent_id="reviewer_001",
-            data={
-                "content": "研究分析报告",
-                "type": "学术报告",
-                "audience": "专业研究人员",
-                "focus": ["学术严谨性", "论证逻辑", "创新性", "实用价值"]
-            },
-            dependencies=[f"{workflow_id}_report_writing"],
-            priority=5
-        )
-        self.coordinator.add_task_to_workflow(workflow_id, peer_review_task)
-        
-        print(f"🔬 创建研究分析工作流: {research_topic}")
-        return workflow
+        return self._materialize(_TEMPLATE_SPECS[name], input_data)
     
-    async def create_custom_workflow(self, workflow_name: str, tasks: List[Dict[str, Any]]) -> Workflow:
+    async def create_custom_workflow(self, workflow_name: str,
+                                     tasks: List[Union[TaskSpec, Dict[str, Any]]]) -> Workflow:
         """
         创建自定义工作流
         
         Args:
             workflow_name: 工作流名称
-            tasks: 任务定义列表
+            tasks: 任务定义列表，元素为TaskSpec或等价的字典
             
         Returns:
             创建的工作流
+            
+        Raises:
+            ValueError: 任务依赖中存在环或引用了不存在的任务
         """
-        workflow_id = f"custom_{int(datetime.now().timestamp())}"
+        workflow_id = f"custom_{next(_WF_COUNTER)}"
+        
+        # 任务较多时在线程中构建，其他工作流可以继续推进
+        if len(tasks) > CUSTOM_BUILD_THREAD_THRESHOLD:
+            built_tasks = await asyncio.to_thread(self._build_custom_tasks, workflow_id, tasks)
+        else:
+            built_tasks = self._build_custom_tasks(workflow_id, tasks)
+        
+        # 提交给协调器前检查依赖，存在环或引用未知任务时直接报错，避免执行时互相等待
+        self._topo_levels(built_tasks)
         
         workflow = self.coordinator.create_workflow(
             workflow_id=workflow_id,
             name=workflow_name,
             description="自定义多Agent工作流"
         )
+        self.coordinator.add_tasks_to_workflow(workflow_id, built_tasks)
         
-        for task_def in tasks:
-            task = self.coordinator.create_task(
-                task_id=task_def.get("id", f"{workflow_id}_{len(workflow.tasks)}"),
-                task_type=task_def["type"],
-                agent_id=task_def["agent_id"],
-                data=task_def["data"],
-                dependencies=task_def.get("dependencies", []),
-                priority=task_def.get("priority", 5),
-                timeout=task_def.get("timeout", 300)
-            )
-            self.coordinator.add_task_to_workflow(workflow_id, task)
-        
-        print(f"🎯 创建自定义工作流: {workflow_name}")
+        logger.info("🎯 创建自定义工作流: %s", workflow_name)
         return workflow
     
-    def get_available_templates(self) -> List[str]:
-        """获取可用的工作流模板列表"""
-        return list(self.workflow_templates.keys())
+    def _build_custom_tasks(self, workflow_id: str,
+                            tasks: List[Union[TaskSpec, Dict[str, Any]]]) -> List[WorkflowTask]:
+        """
+        根据任务定义构建工作流任务
+        
+        Args:
+            workflow_id: 工作流ID，用于生成默认任务ID
+            tasks: 任务定义列表，元素为TaskSpec或等价的字典
+            
+        Returns:
+            构建好的任务列表
+        """
+        specs = [
+            spec if isinstance(spec, TaskSpec) else TaskSpec.from_dict(spec)
+            for spec in tasks
+        ]
+        return [
+            self.coordinator.create_task(
+                task_id=spec.id or f"{workflow_id}_{i}",
+                task_type=spec.type,
+                agent_id=spec.agent_id,
+                data=spec.data,
+                dependencies=list(spec.dependencies),
+                priority=spec.priority,
+                timeout=spec.timeout,
+                bypass_cache=spec.bypass_cache
+            )
+            for i, spec in enumerate(specs)
+        ]
+    
+    def get_available_templates(self) -> Tuple[str, ...]:
+        """获取可用的工作流模板名称（注册模板时生成的只读元组）"""
+        return self._available_templates
     
-    def get_template_description(self, template_name: str) -> Dict[str, Any]:
+    def get_template_description(self, template_name: str) -> Mapping[str, Any]:
         """
         获取模板描述
         
@@ -573,50 +866,7 @@ class MultiAgentWorkflow:
         Returns:
             模板描述信息
         """
-        descriptions = {
-            "document_creation": {
-                "name": "文档撰写工作流",
-                "description": "多Agent协作完成文档撰写，包括研究、规划、执行、审查四个阶段",
-                "agents": ["研究员", "规划师", "执行者", "审查员"],
-                "stages": ["主题研究", "撰写规划", "文档执行", "质量审查"],
-                "input_required": ["topic", "requirements"],
-                "output": "高质量的文档内容及评审报告"
-            },
-            "project_planning": {
-                "name": "项目规划工作流", 
-                "description": "全面的项目规划流程，包括需求分析、计划制定、风险评估和审查",
-                "agents": ["研究员", "规划师", "审查员"],
-                "stages": ["需求研究", "计划制定", "风险评估", "计划审查"],
-                "input_required": ["project_name", "objectives", "constraints"],
-                "output": "完整的项目计划和风险评估报告"
-            },
-            "problem_solving": {
-                "name": "问题解决工作流",
-                "description": "系统性的问题解决流程，从分析到实施再到验证",
-                "agents": ["研究员", "规划师", "执行者", "审查员"],
-                "stages": ["问题分析", "方案规划", "方案实施", "效果验证"],
-                "input_required": ["problem", "context"],
-                "output": "问题解决方案及实施验证报告"
-            },
-            "quality_improvement": {
-                "name": "质量改进工作流",
-                "description": "全面的质量改进流程，包括评估、分析、改进和验证",
-                "agents": ["审查员", "研究员", "规划师", "执行者"],
-                "stages": ["现状评估", "根因分析", "改进规划", "措施实施", "效果验证"],
-                "input_required": ["target", "current_state"],
-                "output": "质量改进方案及效果评估报告"
-            },
-            "research_analysis": {
-                "name": "研究分析工作流",
-                "description": "学术研究和分析流程，包括数据收集、分析、报告撰写和评议",
-                "agents": ["研究员", "规划师", "执行者", "审查员"],
-                "stages": ["数据收集", "文献综述", "报告规划", "报告撰写", "同行评议"],
-                "input_required": ["topic", "scope"],
-                "output": "研究分析报告及同行评议结果"
-            }
-        }
-        
-        return descriptions.get(template_name, {"error": "模板不存在"})
+        return _TEMPLATE_DESCRIPTIONS.get(template_name, _MISSING_TEMPLATE)
     
     def get_workflow_results(self, workflow_id: str) -> Dict[str, Any]:
         """
@@ -626,60 +876,114 @@ class MultiAgentWorkflow:
             workflow_id: 工作流ID
             
         Returns:
-            工作流结果汇总
+            工作流结果汇总，每次调用返回新的字典，调用方修改不影响缓存
         """
-        if workflow_id not in self.coordinator.workflows:
+        workflow = self.coordinator.workflows.get(workflow_id)
+        if workflow is None:
+            # 工作流已被移除，一并丢弃其缓存结果
+            self._results_cache.pop(workflow_id, None)
             raise ValueError(f"工作流不存在: {workflow_id}")
         
-        workflow = self.coordinator.workflows[workflow_id]
-        
-        # 收集所有任务结果
-        task_results = []
-        for task in workflow.tasks:
-            if task.result:
-                task_results.append({
-                    "task_id": task.task_id,
-                    "agent_id": task.agent_id,
-                    "status": task.result.status,
-                    "result": task.result.result,
-                    "execution_time": task.result.execution_time,
-                    "error_message": task.result.error_message
-                })
+        # 已结束的工作流结果不再变化，执行摘要未变时直接返回缓存
+        summary = workflow.execution_summary
+        cached = self._results_cache.get(workflow_id)
+        if summary is not None and cached is not None and cached[0] is summary:
+            self._results_cache.move_to_end(workflow_id)
+            return self._copy_results(cached[1])
+        
+        # 收集所有任务结果，成功/失败数量由协调器在任务状态变化时维护
+        task_results = [
+            {
+                "task_id": task.task_id,
+                "agent_id": task.agent_id,
+                "status": task.result.status,
+                "result": task.result.result,
+                "execution_time": task.result.execution_time,
+                "error_message": task.result.error_message
+            }
+            for task in workflow.tasks if task.result
+        ]
         
-        return {
+        results = {
             "workflow_id": workflow_id,
             "workflow_name": workflow.name,
             "status": workflow.status.value,
             "progress": workflow.progress,
             "task_results": task_results,
             "total_tasks": len(workflow.tasks),
-            "successful_tasks": len([t for t in workflow.tasks if t.status == "completed"]),
-            "failed_tasks": len([t for t in workflow.tasks if t.status == "failed"]),
-            "execution_summary": {
-                "started_at": workflow.started_at.isoformat() if workflow.started_at else None,
-                "completed_at": workflow.completed_at.isoformat() if workflow.completed_at else None,
-                "total_time": (
-                    (workflow.completed_at - workflow.started_at).total_seconds()
-                    if workflow.started_at and workflow.completed_at else None
-                )
-            }
+            "successful_tasks": workflow.completed_count,
+            "failed_tasks": workflow.failed_count,
+            "execution_summary": summary if summary is not None else workflow.summarize_execution()
         }
+        
+        if summary is not None:
+            self._results_cache[workflow_id] = (summary, results)
+            self._results_cache.move_to_end(workflow_id)
+            if len(self._results_cache) > RESULTS_CACHE_SIZE:
+                self._results_cache.popitem(last=False)
+            return self._copy_results(results)
+        
+        return results
+    
+    @staticmethod
+    def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+        """深拷贝结果汇总（含各任务结果和执行摘要），调用方修改任何一层都不影响缓存"""
+        return copy.deepcopy(results)
+    
+    def reset_system(self):
+        """重置协调器，并清除与已移除工作流相关的结果缓存"""
+        self.coordinator.reset_system()
+        self._results_cache.clear()
+    
+    async def refresh_system_snapshot(self):
+        """
+        重新拉取所有Agent的性能统计并刷新系统快照
+        
+        各Agent的统计查询通过 asyncio.gather 并发进行，
+        统计接口为异步（如接入外部指标存储）时总耗时取决于最慢的一个。
+        """
+        agents = list(self.coordinator.agents.values())
+        stats = await asyncio.gather(
+            *(_maybe_await(agent.get_performance_stats()) for agent in agents)
+        )
+        for agent, agent_stats in zip(agents, stats):
+            self.on_agent_stats_updated(agent.agent_id, agent_stats)
     
-    def get_system_overview(self) -> Dict[str, Any]:
-        """获取系统总览"""
+    async def get_system_overview(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        获取系统总览
+        
+        Agent信息来自状态变化时推送更新的快照。
+        
+        Args:
+            refresh: 是否先重新拉取所有Agent的性能统计
+            
+        Returns:
+            包含协调器状态、Agent信息和工作流模板的字典
+        """
+        if refresh:
+            await self.refresh_system_snapshot()
         return {
             "coordinator_status": self.coordinator.get_system_status(),
-            "available_agents": {
-                agent_id: {
-                    "name": agent.name,
-                    "description": agent.description,
-                    "status": agent.status,
-                    "performance": agent.get_performance_stats()
-                }
-                for agent_id, agent in self.coordinator.agents.items()
-            },
-            "workflow_templates": {
-                name: self.get_template_description(name)
-                for name in self.workflow_templates.keys()
-            }
+            "available_agents": self._system_snapshot["available_agents"],
+            "workflow_templates": _TEMPLATE_DESCRIPTIONS
         }
+    
+    def get_system_overview_sync(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        同步获取系统总览，供事件循环之外的代码使用
+        
+        Args:
+            refresh: 是否先重新拉取所有Agent的性能统计
+            
+        Returns:
+            与 get_system_overview 相同的系统总览
+            
+        Raises:
+            RuntimeError: 在运行中的事件循环内调用时，应改用 await get_system_overview()
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return run_async(self.get_system_overview(refresh))
+        raise RuntimeError("get_system_overview_sync 不能在运行中的事件循环内调用，请改用 await get_system_overview()")
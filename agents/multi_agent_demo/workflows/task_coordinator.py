@@ -10,14 +10,22 @@
 5. 异常处理和恢复
 """
 import asyncio
+import hashlib
+import heapq
 import json
-from typing import Dict, Any, List, Optional, Callable
+import logging
+import random
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Any, List, Optional, Callable
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 from agents import BaseAgent, Message, TaskResult
 
+logger = logging.getLogger(__name__)
+
 class WorkflowStatus(Enum):
     """工作流状态枚举"""
     IDLE = "idle"
@@ -27,7 +35,7 @@ class WorkflowStatus(Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowTask:
     """工作流任务定义"""
     task_id: str
@@ -40,12 +48,14 @@ class WorkflowTask:
     retry_count: int = 0
     max_retries: int = 3
     status: str = "pending"  # pending, running, completed, failed
+    bypass_cache: bool = False  # 结果不确定的任务不读写结果缓存
+    workflow_id: Optional[str] = None  # 所属工作流ID，加入工作流时由协调器设置
     result: Optional[TaskResult] = None
     created_at: datetime = field(default_factory=datetime.now)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-@dataclass 
+@dataclass(slots=True)
 class Workflow:
     """工作流定义"""
     workflow_id: str
@@ -58,6 +68,23 @@ class Workflow:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    # 已结束任务的计数，由协调器在任务状态变化时更新
+    completed_count: int = 0
+    failed_count: int = 0
+    # 最近一次执行的耗时（秒），由单调时钟计算，不受系统时间调整影响
+    total_time: Optional[float] = None
+    # 工作流结束时生成的执行摘要，结束后不再变化
+    execution_summary: Optional[Dict[str, Any]] = None
+    # 各状态的任务数量，由协调器在添加任务和任务状态变化时更新
+    task_status_counts: Counter = field(default_factory=Counter)
+    
+    def summarize_execution(self) -> Dict[str, Any]:
+        """生成执行摘要：开始时间、结束时间和总耗时"""
+        return {
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "total_time": self.total_time
+        }
 
 class TaskCoordinator:
     """
@@ -71,19 +98,56 @@ class TaskCoordinator:
     def __init__(self):
         self.agents: Dict[str, BaseAgent] = {}
         self.workflows: Dict[str, Workflow] = {}
-        self.message_queue: List[Message] = []
-        self.task_history: List[TaskResult] = []
         
         # 配置参数
         self.max_concurrent_tasks = 5
         self.default_timeout = 300
         self.message_batch_size = 10
+        self.enable_memoization = True  # 是否复用相同输入任务的成功结果
+        self.retry_base_delay = 0.5  # 重试退避的基础等待时间（秒），按重试次数指数增长
+        self.retry_max_delay = 30.0  # 单次重试等待时间上限（秒）
+        self.retry_jitter = 0.5  # 重试等待时间的随机抖动上限（秒）
+        self.result_cache_limit = 1_000  # 结果缓存最多保留的条数，超出时淘汰最久未使用的
+        
+        # 有界环形缓冲区，超出上限时自动丢弃最早的记录；
+        # 上限通过 history_limit / message_queue_limit 属性调整
+        self.message_queue: Deque[Message] = deque(maxlen=10_000)
+        self.task_history: Deque[TaskResult] = deque(maxlen=10_000)
         
         # 运行状态
         self.is_running = False
         self.current_tasks: Dict[str, asyncio.Task] = {}
         
-        print("🎛️ 任务协调器初始化完成")
+        # 任务结果缓存（LRU）: 任务指纹 -> 成功的任务结果
+        self._result_cache: "OrderedDict[str, TaskResult]" = OrderedDict()
+        
+        # 任务历史中成功的任务数量，用于计算成功率
+        self._task_success_count = 0
+        
+        # 各状态的工作流数量，在创建工作流和工作流状态变化时更新
+        self._workflow_status_counter: Counter = Counter({status: 0 for status in WorkflowStatus})
+        
+        logger.info("🎛️ 任务协调器初始化完成")
+    
+    @property
+    def history_limit(self) -> int:
+        """任务历史最多保留的条数"""
+        return self.task_history.maxlen
+    
+    @history_limit.setter
+    def history_limit(self, limit: int):
+        # 按新上限重建队列，只保留最近的记录，并重新统计成功数量
+        self.task_history = deque(self.task_history, maxlen=limit)
+        self._task_success_count = sum(1 for result in self.task_history if result.status == "success")
+    
+    @property
+    def message_queue_limit(self) -> int:
+        """消息队列最多保留的条数"""
+        return self.message_queue.maxlen
+    
+    @message_queue_limit.setter
+    def message_queue_limit(self, limit: int):
+        self.message_queue = deque(self.message_queue, maxlen=limit)
     
     def register_agent(self, agent: BaseAgent):
         """
@@ -93,7 +157,7 @@ class TaskCoordinator:
             agent: 要注册的Agent实例
         """
         self.agents[agent.agent_id] = agent
-        print(f"📝 注册Agent: {agent.name} ({agent.agent_id})")
+        logger.info("📝 注册Agent: %s (%s)", agent.name, agent.agent_id)
     
     def unregister_agent(self, agent_id: str):
         """
@@ -102,10 +166,9 @@ class TaskCoordinator:
         Args:
             agent_id: Agent ID
         """
-        if agent_id in self.agents:
-            agent_name = self.agents[agent_id].name
-            del self.agents[agent_id]
-            print(f"📝 注销Agent: {agent_name} ({agent_id})")
+        agent = self.agents.pop(agent_id, None)
+        if agent is not None:
+            logger.info("📝 注销Agent: %s (%s)", agent.name, agent_id)
     
     def create_workflow(self, workflow_id: str, name: str, 
                        description: str = "") -> Workflow:
@@ -125,8 +188,12 @@ class TaskCoordinator:
             name=name,
             description=description
         )
+        replaced = self.workflows.get(workflow_id)
+        if replaced is not None:
+            self._workflow_status_counter[replaced.status] -= 1
         self.workflows[workflow_id] = workflow
-        print(f"📋 创建工作流: {name} ({workflow_id})")
+        self._workflow_status_counter[workflow.status] += 1
+        logger.info("📋 创建工作流: %s (%s)", name, workflow_id)
         return workflow
     
     def add_task_to_workflow(self, workflow_id: str, task: WorkflowTask):
@@ -137,16 +204,37 @@ class TaskCoordinator:
             workflow_id: 工作流ID
             task: 要添加的任务
         """
-        if workflow_id not in self.workflows:
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
             raise ValueError(f"工作流不存在: {workflow_id}")
         
-        workflow = self.workflows[workflow_id]
+        task.workflow_id = workflow_id
         workflow.tasks.append(task)
-        print(f"➕ 向工作流 {workflow.name} 添加任务: {task.task_id}")
+        workflow.task_status_counts[task.status] += 1
+        logger.info("➕ 向工作流 %s 添加任务: %s", workflow.name, task.task_id)
+    
+    def add_tasks_to_workflow(self, workflow_id: str, tasks: List[WorkflowTask]):
+        """
+        向工作流批量添加任务
+        
+        Args:
+            workflow_id: 工作流ID
+            tasks: 要添加的任务列表
+        """
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
+            raise ValueError(f"工作流不存在: {workflow_id}")
+        
+        for task in tasks:
+            task.workflow_id = workflow_id
+        workflow.tasks.extend(tasks)
+        workflow.task_status_counts.update(task.status for task in tasks)
+        logger.info("➕ 向工作流 %s 添加 %d 个任务", workflow.name, len(tasks))
     
     def create_task(self, task_id: str, task_type: str, agent_id: str,
                    data: Dict[str, Any], dependencies: List[str] = None,
-                   priority: int = 1, timeout: int = None) -> WorkflowTask:
+                   priority: int = 1, timeout: int = None,
+                   bypass_cache: bool = False) -> WorkflowTask:
         """
         创建工作流任务
         
@@ -158,6 +246,7 @@ class TaskCoordinator:
             dependencies: 依赖的任务ID列表
             priority: 任务优先级
             timeout: 超时时间
+            bypass_cache: 是否跳过结果缓存，结果不确定的任务应设为True
             
         Returns:
             创建的任务对象
@@ -172,10 +261,11 @@ class TaskCoordinator:
             data=data,
             dependencies=dependencies or [],
             priority=priority,
-            timeout=timeout or self.default_timeout
+            timeout=timeout or self.default_timeout,
+            bypass_cache=bypass_cache
         )
         
-        print(f"🎯 创建任务: {task_id} -> {agent_id}")
+        logger.debug("🎯 创建任务: %s -> %s", task_id, agent_id)
         return task
     
     async def execute_workflow(self, workflow_id: str) -> Workflow:
@@ -188,34 +278,63 @@ class TaskCoordinator:
         Returns:
             执行完成的工作流对象
         """
-        if workflow_id not in self.workflows:
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
             raise ValueError(f"工作流不存在: {workflow_id}")
         
-        workflow = self.workflows[workflow_id]
-        print(f"🚀 开始执行工作流: {workflow.name}")
+        logger.info("🚀 开始执行工作流: %s", workflow.name)
         
-        workflow.status = WorkflowStatus.RUNNING
+        self._set_workflow_status(workflow, WorkflowStatus.RUNNING)
         workflow.started_at = datetime.now()
+        workflow.total_time = None
+        start_time = time.perf_counter()
+        workflow.execution_summary = None
         
         try:
             await self._execute_workflow_tasks(workflow)
             
-            workflow.status = WorkflowStatus.COMPLETED
+            self._set_workflow_status(workflow, WorkflowStatus.COMPLETED)
             workflow.completed_at = datetime.now()
+            workflow.total_time = time.perf_counter() - start_time
+            workflow.execution_summary = workflow.summarize_execution()
             workflow.progress = 100.0
             
-            print(f"✅ 工作流执行完成: {workflow.name}")
+            logger.info("✅ 工作流执行完成: %s", workflow.name)
+            
+        except asyncio.CancelledError:
+            # 调用方超时或取消时标记为已取消，不会一直停留在运行状态
+            self._set_workflow_status(workflow, WorkflowStatus.CANCELLED)
+            workflow.error_message = "工作流被取消"
+            workflow.completed_at = datetime.now()
+            workflow.total_time = time.perf_counter() - start_time
+            workflow.execution_summary = workflow.summarize_execution()
+            raise
             
         except Exception as e:
-            workflow.status = WorkflowStatus.FAILED
+            self._set_workflow_status(workflow, WorkflowStatus.FAILED)
             workflow.error_message = str(e)
             workflow.completed_at = datetime.now()
+            workflow.total_time = time.perf_counter() - start_time
+            workflow.execution_summary = workflow.summarize_execution()
             
-            print(f"❌ 工作流执行失败: {workflow.name} - {str(e)}")
+            logger.error("❌ 工作流执行失败: %s - %s", workflow.name, e)
             raise e
         
         return workflow
     
+    def _set_workflow_status(self, workflow: Workflow, status: WorkflowStatus):
+        """
+        更新工作流状态，并同步各状态的工作流计数
+        
+        Args:
+            workflow: 工作流对象
+            status: 新状态
+        """
+        counter = self._workflow_status_counter
+        counter[workflow.status] -= 1
+        counter[status] += 1
+        workflow.status = status
+    
     async def _execute_workflow_tasks(self, workflow: Workflow):
         """
         执行工作流中的所有任务
@@ -225,93 +344,155 @@ class TaskCoordinator:
         """
         completed_tasks = set()
         running_tasks = {}
+        # 已结束任务的ID由完成回调放入队列；每次执行独立一个队列，并发执行的工作流互不干扰
+        done_queue: asyncio.Queue = asyncio.Queue()
         
-        while len(completed_tasks) < len(workflow.tasks):
-            # 查找可以执行的任务
-            ready_tasks = self._get_ready_tasks(workflow, completed_tasks, running_tasks)
-            
+        try:
+            await self._run_task_loop(workflow, completed_tasks, running_tasks, done_queue)
+        finally:
+            # 被取消时一并取消仍在运行的任务
+            for async_task in running_tasks.values():
+                async_task.cancel()
+    
+    async def _run_task_loop(self, workflow: Workflow, completed_tasks: set,
+                             running_tasks: dict, done_queue: asyncio.Queue):
+        """
+        调度循环：按依赖关系启动任务并等待完成
+        
+        Args:
+            workflow: 工作流对象
+            completed_tasks: 已完成的任务ID集合
+            running_tasks: 正在运行的任务字典
+            done_queue: 已结束任务ID的队列，由任务的完成回调填充
+        """
+        tasks = workflow.tasks
+        remaining_deps, children, ready_heap, task_index = self._build_schedule_state(workflow)
+        
+        # 异步任务以工作流任务ID命名，完成回调直接读取名称，所有任务共用一个回调
+        def on_task_done(async_task: asyncio.Task):
+            done_queue.put_nowait(async_task.get_name())
+        
+        while len(completed_tasks) < len(tasks):
             # 控制并发数量
             available_slots = self.max_concurrent_tasks - len(running_tasks)
-            tasks_to_start = ready_tasks[:available_slots]
             
-            # 启动新任务
-            for task in tasks_to_start:
-                print(f"⚡ 启动任务: {task.task_id}")
-                task.status = "running"
-                task.started_at = datetime.now()
+            # 按优先级从就绪堆中取出任务启动，同一批启动的任务共用一个时间戳
+            started_at = datetime.now() if ready_heap else None
+            while available_slots > 0 and ready_heap:
+                task = tasks[heapq.heappop(ready_heap)[1]]
+                available_slots -= 1
+                
+                logger.info("⚡ 启动任务: %s", task.task_id)
+                self._set_task_status(task, "running")
+                task.started_at = started_at
                 
                 # 创建异步任务
                 coroutine = self._execute_single_task(task)
-                async_task = asyncio.create_task(coroutine)
+                async_task = asyncio.create_task(coroutine, name=task.task_id)
+                async_task.add_done_callback(on_task_done)
                 running_tasks[task.task_id] = async_task
             
-            # 等待至少一个任务完成
-            if running_tasks:
-                done, pending = await asyncio.wait(
-                    running_tasks.values(),
-                    return_when=asyncio.FIRST_COMPLETED
-                )
+            # 没有可启动也没有运行中的任务，剩余任务的依赖无法满足，避免无限循环
+            if not running_tasks:
+                remaining_tasks = [t for t in workflow.tasks if t.task_id not in completed_tasks]
+                unresolved_deps = []
+                for task in remaining_tasks:
+                    for dep in task.dependencies:
+                        if dep not in completed_tasks:
+                            unresolved_deps.append(f"{task.task_id} -> {dep}")
                 
-                # 处理完成的任务
-                for async_task in done:
-                    task_id = None
-                    for tid, atask in running_tasks.items():
-                        if atask == async_task:
-                            task_id = tid
-                            break
-                    
-                    if task_id:
-                        del running_tasks[task_id]
-                        completed_tasks.add(task_id)
-                        
-                        # 更新进度
-                        workflow.progress = len(completed_tasks) / len(workflow.tasks) * 100
-                        print(f"📊 工作流进度: {workflow.progress:.1f}%")
+                raise Exception(f"任务依赖无法解决: {unresolved_deps}")
             
-            # 避免无限循环
-            if not ready_tasks and not running_tasks:
-                remaining_tasks = [t for t in workflow.tasks if t.task_id not in completed_tasks]
-                if remaining_tasks:
-                    unresolved_deps = []
-                    for task in remaining_tasks:
-                        for dep in task.dependencies:
-                            if dep not in completed_tasks:
-                                unresolved_deps.append(f"{task.task_id} -> {dep}")
-                    
-                    raise Exception(f"任务依赖无法解决: {unresolved_deps}")
-                break
+            # 等待至少一个任务完成，并一并处理同时结束的其他任务
+            finished_ids = [await done_queue.get()]
+            while not done_queue.empty():
+                finished_ids.append(done_queue.get_nowait())
+            
+            # 处理完成的任务
+            for task_id in finished_ids:
+                del running_tasks[task_id]
+                completed_tasks.add(task_id)
+                finished_index = task_index[task_id]
+                
+                # 依赖全部完成的后续任务进入就绪堆
+                for child_index in children[finished_index]:
+                    remaining_deps[child_index] -= 1
+                    if remaining_deps[child_index] == 0:
+                        child = tasks[child_index]
+                        if child.status not in ("completed", "running"):
+                            heapq.heappush(ready_heap, (-child.priority, child_index))
+                
+                # 更新进度
+                workflow.progress = len(completed_tasks) / len(workflow.tasks) * 100
+                logger.debug("📊 工作流进度: %.1f%%", workflow.progress)
     
-    def _get_ready_tasks(self, workflow: Workflow, completed_tasks: set, 
-                        running_tasks: dict) -> List[WorkflowTask]:
+    def _build_schedule_state(self, workflow: Workflow):
         """
-        获取可以执行的任务列表
+        构建事件驱动调度所需的依赖状态
+        
+        状态按任务下标存放在平行列表中，调度循环中只做列表下标访问，不再按任务ID查字典。
+        就绪堆的条目为 (-优先级, 任务下标)，优先级高的先出堆，同优先级按任务在工作流中的顺序。
         
         Args:
             workflow: 工作流对象
-            completed_tasks: 已完成的任务ID集合
-            running_tasks: 正在运行的任务字典
             
         Returns:
-            可以执行的任务列表
+            (剩余依赖数列表, 后续任务下标列表, 初始就绪堆, 任务ID -> 任务下标) 四元组
+        """
+        tasks = workflow.tasks
+        task_index = {task.task_id: index for index, task in enumerate(tasks)}
+        remaining_deps = [0] * len(tasks)
+        children: List[List[int]] = [[] for _ in tasks]
+        ready_heap = []
+        
+        for index, task in enumerate(tasks):
+            dependencies = task.dependencies
+            remaining_deps[index] = len(dependencies)
+            for dep in dependencies:
+                # 引用不存在的任务时该任务永远不会就绪，由调度循环报告依赖无法解决
+                dep_index = task_index.get(dep)
+                if dep_index is not None:
+                    children[dep_index].append(index)
+            if not dependencies and task.status not in ("completed", "running"):
+                ready_heap.append((-task.priority, index))
+        
+        heapq.heapify(ready_heap)
+        
+        return remaining_deps, children, ready_heap, task_index
+    
+    def _set_task_status(self, task: WorkflowTask, status: str):
         """
-        ready_tasks = []
+        更新任务状态，并同步所属工作流的任务状态计数和已结束任务计数
         
-        for task in workflow.tasks:
-            # 跳过已完成或正在运行的任务
-            if (task.task_id in completed_tasks or 
-                task.task_id in running_tasks or
-                task.status in ["completed", "running"]):
-                continue
-            
-            # 检查依赖是否满足
-            dependencies_met = all(dep in completed_tasks for dep in task.dependencies)
-            
-            if dependencies_met:
-                ready_tasks.append(task)
+        直接调用 _execute_single_task 执行的任务同样按 task.workflow_id 找到所属工作流。
+        
+        Args:
+            task: 工作流任务
+            status: 新状态
+        """
+        workflow = self.workflows.get(task.workflow_id) if task.workflow_id else None
+        if workflow is not None:
+            counts = workflow.task_status_counts
+            counts[task.status] -= 1
+            counts[status] += 1
+            workflow.completed_count = counts["completed"]
+            workflow.failed_count = counts["failed"]
+        task.status = status
+    
+    def _record_result(self, result: TaskResult):
+        """
+        记录任务结果到历史
         
-        # 按优先级排序
-        ready_tasks.sort(key=lambda t: t.priority, reverse=True)
-        return ready_tasks
+        Args:
+            result: 任务结果
+        """
+        history = self.task_history
+        # 历史已满时最早的记录会被丢弃，成功计数同步扣除
+        if len(history) == history.maxlen and history[0].status == "success":
+            self._task_success_count -= 1
+        history.append(result)
+        if result.status == "success":
+            self._task_success_count += 1
     
     async def _execute_single_task(self, task: WorkflowTask) -> TaskResult:
         """
@@ -325,79 +506,114 @@ class TaskCoordinator:
         """
         agent = self.agents[task.agent_id]
         
-        try:
-            # 准备任务数据
-            task_data = {
-                "id": task.task_id,
-                "type": task.task_type,
-                "data": task.data
-            }
-            
-            # 执行任务（带超时控制）
-            result = await asyncio.wait_for(
-                agent.execute_task(task_data),
-                timeout=task.timeout
-            )
-            
+        # 相同输入的任务直接复用缓存结果；重试时重新执行，不读缓存
+        use_cache = self.enable_memoization and not task.bypass_cache
+        fingerprint = self._fingerprint(task) if use_cache else None
+        cached = self._result_cache.get(fingerprint) if use_cache and task.retry_count == 0 else None
+        if cached is not None:
+            self._result_cache.move_to_end(fingerprint)
+            result = replace(cached, task_id=task.task_id)
             task.result = result
-            task.status = "completed"
+            self._set_task_status(task, "completed")
             task.completed_at = datetime.now()
+            self._record_result(result)
             
-            # 记录到历史
-            self.task_history.append(result)
-            
-            print(f"✅ 任务完成: {task.task_id}")
+            logger.info("♻️ 复用缓存结果: %s", task.task_id)
             return result
+        
+        # 准备任务数据
+        task_data = {
+            "id": task.task_id,
+            "type": task.task_type,
+            "data": task.data
+        }
+        
+        while True:
+            try:
+                # 执行任务（带超时控制）
+                result = await asyncio.wait_for(
+                    agent.execute_task(task_data),
+                    timeout=task.timeout
+                )
+                
+                task.result = result
+                self._set_task_status(task, "completed")
+                task.completed_at = datetime.now()
+                
+                # 记录到历史
+                self._record_result(result)
+                
+                if use_cache and result.status == "success":
+                    self._result_cache[fingerprint] = result
+                    self._result_cache.move_to_end(fingerprint)
+                    if len(self._result_cache) > self.result_cache_limit:
+                        self._result_cache.popitem(last=False)
+                
+                logger.info("✅ 任务完成: %s", task.task_id)
+                return result
+                
+            except asyncio.TimeoutError:
+                error_msg = f"任务超时: {task.task_id} (超时时间: {task.timeout}s)"
+                error = Exception(error_msg)
+                logger.warning("⏰ %s", error_msg)
+                
+            except Exception as e:
+                error_msg = f"任务执行失败: {task.task_id} - {str(e)}"
+                error = e
+                logger.warning("❌ %s", error_msg)
             
-        except asyncio.TimeoutError:
-            error_msg = f"任务超时: {task.task_id} (超时时间: {task.timeout}s)"
-            result = TaskResult(
+            task.result = TaskResult(
                 agent_id=task.agent_id,
                 task_id=task.task_id,
                 status="failed",
                 result=None,
                 error_message=error_msg
             )
-            
-            task.result = result
-            task.status = "failed"
+            self._set_task_status(task, "failed")
             task.completed_at = datetime.now()
             
-            print(f"⏰ {error_msg}")
-            
             # 是否重试
-            if task.retry_count < task.max_retries:
-                task.retry_count += 1
-                task.status = "pending"
-                print(f"🔄 任务重试: {task.task_id} (第{task.retry_count}次)")
-                return await self._execute_single_task(task)
+            if task.retry_count >= task.max_retries:
+                raise error
             
-            raise Exception(error_msg)
+            task.retry_count += 1
+            self._set_task_status(task, "pending")
             
-        except Exception as e:
-            error_msg = f"任务执行失败: {task.task_id} - {str(e)}"
-            result = TaskResult(
-                agent_id=task.agent_id,
-                task_id=task.task_id,
-                status="failed",
-                result=None,
-                error_message=error_msg
-            )
-            
-            task.result = result
-            task.status = "failed"
-            task.completed_at = datetime.now()
-            
-            print(f"❌ {error_msg}")
+            # 指数退避加随机抖动，避免下游服务抖动时立即重试再次失败
+            delay = self._retry_delay(task.retry_count)
+            logger.info("🔄 任务重试: %s (第%d次，%.1f秒后)", task.task_id, task.retry_count, delay)
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, retry_count: int) -> float:
+        """
+        计算第 retry_count 次重试前的等待时间
+        
+        Args:
+            retry_count: 重试次数，从1开始
             
-            # 是否重试
-            if task.retry_count < task.max_retries:
-                task.retry_count += 1
-                task.status = "pending"
-                print(f"🔄 任务重试: {task.task_id} (第{task.retry_count}次)")
-                return await self._execute_single_task(task)
+        Returns:
+            等待时间（秒）
+        """
+        delay = self.retry_base_delay * 2 ** retry_count + random.random() * self.retry_jitter
+        return min(self.retry_max_delay, delay)
+    
+    def _fingerprint(self, task: WorkflowTask) -> str:
+        """
+        计算任务指纹
+        
+        由执行Agent、任务类型和任务数据共同决定，与任务ID无关。
+        
+        Args:
+            task: 工作流任务
             
-            raise e
+        Returns:
+            任务指纹字符串
+        """
+        payload = json.dumps(
+            {"a": task.agent_id, "t": task.task_type, "d": task.data},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
     
     def send_message(self, sender_id: str, receiver_id: str, 
                     content: str, message_type: str = "text",
@@ -412,7 +628,8 @@ class TaskCoordinator:
             message_type: 消息类型
             metadata: 元数据
         """
-        if receiver_id not in self.agents:
+        receiver_agent = self.agents.get(receiver_id)
+        if receiver_agent is None:
             raise ValueError(f"接收者Agent不存在: {receiver_id}")
         
         message = Message(
@@ -427,10 +644,9 @@ class TaskCoordinator:
         self.message_queue.append(message)
         
         # 直接发送给接收者
-        receiver_agent = self.agents[receiver_id]
         receiver_agent.add_message(message)
         
-        print(f"📨 消息发送: {sender_id} -> {receiver_id}")
+        logger.debug("📨 消息发送: %s -> %s", sender_id, receiver_id)
     
     def broadcast_message(self, sender_id: str, content: str,
                          message_type: str = "broadcast",
@@ -444,13 +660,28 @@ class TaskCoordinator:
             message_type: 消息类型
             exclude_agents: 排除的Agent ID列表
         """
-        exclude_agents = exclude_agents or []
-        
-        for agent_id in self.agents:
-            if agent_id != sender_id and agent_id not in exclude_agents:
-                self.send_message(sender_id, agent_id, content, message_type)
-        
-        print(f"📢 广播消息: {sender_id} -> 所有Agent")
+        excluded = set(exclude_agents or ())
+        excluded.add(sender_id)
+        
+        # 接收者都来自已注册的Agent，无需逐个校验；同一次广播共用时间戳
+        timestamp = datetime.now()
+        recipients = [
+            (agent, Message(
+                sender=sender_id,
+                receiver=agent_id,
+                content=content,
+                message_type=message_type,
+                timestamp=timestamp
+            ))
+            for agent_id, agent in self.agents.items()
+            if agent_id not in excluded
+        ]
+        
+        self.message_queue.extend(message for _, message in recipients)
+        for agent, message in recipients:
+            agent.add_message(message)
+        
+        logger.info("📢 广播消息: %s -> %d 个Agent", sender_id, len(recipients))
     
     def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """
@@ -462,17 +693,18 @@ class TaskCoordinator:
         Returns:
             工作流状态信息
         """
-        if workflow_id not in self.workflows:
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
             raise ValueError(f"工作流不存在: {workflow_id}")
         
-        workflow = self.workflows[workflow_id]
         
+        counts = workflow.task_status_counts
         task_stats = {
             "total": len(workflow.tasks),
-            "pending": len([t for t in workflow.tasks if t.status == "pending"]),
-            "running": len([t for t in workflow.tasks if t.status == "running"]),
-            "completed": len([t for t in workflow.tasks if t.status == "completed"]),
-            "failed": len([t for t in workflow.tasks if t.status == "failed"])
+            "pending": counts["pending"],
+            "running": counts["running"],
+            "completed": counts["completed"],
+            "failed": counts["failed"]
         }
         
         return {
@@ -497,10 +729,10 @@ class TaskCoordinator:
         Returns:
             Agent状态信息
         """
-        if agent_id not in self.agents:
+        agent = self.agents.get(agent_id)
+        if agent is None:
             raise ValueError(f"Agent不存在: {agent_id}")
         
-        agent = self.agents[agent_id]
         return agent.get_performance_stats()
     
     def get_system_status(self) -> Dict[str, Any]:
@@ -510,18 +742,15 @@ class TaskCoordinator:
         Returns:
             系统状态信息
         """
-        workflow_stats = {}
-        for status in WorkflowStatus:
-            workflow_stats[status.value] = len([
-                w for w in self.workflows.values() 
-                if w.status == status
-            ])
+        counter = self._workflow_status_counter
+        workflow_stats = {status.value: counter[status] for status in WorkflowStatus}
         
+        agent_counts = Counter(agent.status for agent in self.agents.values())
         agent_stats = {
             "total": len(self.agents),
-            "idle": len([a for a in self.agents.values() if a.status == "idle"]),
-            "working": len([a for a in self.agents.values() if a.status == "working"]),
-            "error": len([a for a in self.agents.values() if a.status == "error"])
+            "idle": agent_counts["idle"],
+            "working": agent_counts["working"],
+            "error": agent_counts["error"]
         }
         
         return {
@@ -534,8 +763,7 @@ class TaskCoordinator:
             "tasks": {
                 "total_executed": len(self.task_history),
                 "success_rate": (
-                    len([t for t in self.task_history if t.status == "success"]) / 
-                    len(self.task_history) * 100
+                    self._task_success_count / len(self.task_history) * 100
                 ) if self.task_history else 0
             },
             "messages": {
@@ -544,10 +772,12 @@ class TaskCoordinator:
         }
     
     def clear_history(self):
-        """清除历史记录"""
+        """清除历史记录和任务结果缓存"""
         self.message_queue.clear()
         self.task_history.clear()
-        print("🧹 历史记录已清除")
+        self._task_success_count = 0
+        self._result_cache.clear()
+        logger.info("🧹 历史记录已清除")
     
     def reset_system(self):
         """重置整个系统"""
@@ -557,8 +787,9 @@ class TaskCoordinator:
         
         # 清除工作流
         self.workflows.clear()
+        self._workflow_status_counter = Counter({status: 0 for status in WorkflowStatus})
         
-        # 清除历史
+        # 清除历史和结果缓存
         self.clear_history()
         
-        print("🔄 系统已重置")
+        logger.info("🔄 系统已重置")
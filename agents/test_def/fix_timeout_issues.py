@@ -10,7 +10,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
-from config.llm_config import LLMConfig
+from config.llm_config import get_llm_config
 from workflows.multi_agent_workflow import MultiAgentWorkflow
 
 def apply_timeout_fixes():
@@ -18,7 +18,7 @@ def apply_timeout_fixes():
     print("🔧 正在应用超时问题修复...")
     
     # 修复已经在代码中完成，这里只是验证
-    config = LLMConfig()
+    config = get_llm_config()
     
     print("✅ 已应用以下修复:")
     print("  1. 增加超时时间到120秒")
@@ -94,7 +94,7 @@ async def run_minimal_test():
     """运行最小化测试"""
     print("\n🧪 运行最小化测试...")
     
-    config = LLMConfig()
+    config = get_llm_config()
     
     try:
         # 最简单的请求
@@ -6,18 +6,27 @@ LLM连接和性能测试脚本
 import sys
 import os
 import time
+import asyncio
 import requests
 
+try:
+    import aiohttp  # 可选依赖，仅并发测试使用
+except ImportError:
+    aiohttp = None
+
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.llm_config import LLMConfig
+from config.llm_config import get_llm_config
+
+# 参数测试中同时进行的LLM请求数上限
+TEST_CONCURRENCY = 3
 
 def test_basic_connection():
     """测试基本连接"""
     print("🔗 测试基本连接...")
     
-    config = LLMConfig()
+    config = get_llm_config()
     
     try:
         start_time = time.time()
@@ -38,7 +47,7 @@ def test_simple_request():
     """测试简单请求"""
     print("\n🧪 测试简单请求...")
     
-    config = LLMConfig()
+    config = get_llm_config()
     
     try:
         start_time = time.time()
@@ -61,74 +70,83 @@ def test_simple_request():
         print(f"错误信息: {e}")
         return False
 
-def test_different_token_limits():
+async def _timed_call(sem, config, messages, **kwargs):
+    """
+    在并发上限内调用LLM并计时
+    
+    Returns:
+        (响应内容, 耗时, 异常) 三元组，成功时异常为None
+    """
+    async with sem:
+        start_time = time.time()
+        try:
+            response = await asyncio.to_thread(config.call_llm, messages, **kwargs)
+            return response, time.time() - start_time, None
+        except Exception as e:
+            return None, time.time() - start_time, e
+
+async def test_different_token_limits():
     """测试不同token限制下的性能"""
     print("\n🚀 测试不同token限制下的性能...")
     
-    config = LLMConfig()
+    config = get_llm_config()
     token_limits = [50, 100, 200, 400, 800]
     
     test_message = [
         {"role": "user", "content": "请介绍一下Python编程语言的特点"}
     ]
     
-    for max_tokens in token_limits:
-        try:
-            print(f"\n📊 测试 max_tokens={max_tokens}...")
-            start_time = time.time()
-            
-            response = config.call_llm(test_message, max_tokens=max_tokens)
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
-            
-            print(f"✅ 成功 (耗时: {execution_time:.2f}秒)")
-            print(f"📝 响应长度: {len(response)}字符")
-            
-            if execution_time > 30:
-                print(f"⚠️  响应时间较长: {execution_time:.2f}秒")
-            
-        except Exception as e:
-            end_time = time.time()
-            execution_time = end_time - start_time
-            print(f"❌ 失败 (耗时: {execution_time:.2f}秒): {e}")
+    # 各请求互不依赖，在并发上限内同时发出
+    sem = asyncio.Semaphore(TEST_CONCURRENCY)
+    results = await asyncio.gather(*(
+        _timed_call(sem, config, test_message, max_tokens=max_tokens)
+        for max_tokens in token_limits
+    ))
+    
+    for max_tokens, (response, execution_time, error) in zip(token_limits, results):
+        print(f"\n📊 测试 max_tokens={max_tokens}...")
+        
+        if error is not None:
+            print(f"❌ 失败 (耗时: {execution_time:.2f}秒): {error}")
+            continue
+        
+        print(f"✅ 成功 (耗时: {execution_time:.2f}秒)")
+        print(f"📝 响应长度: {len(response)}字符")
+        
+        if execution_time > 30:
+            print(f"⚠️  响应时间较长: {execution_time:.2f}秒")
 
-def test_agent_specific_params():
+async def test_agent_specific_params():
     """测试Agent专用参数"""
     print("\n🤖 测试Agent专用参数...")
     
-    config = LLMConfig()
+    config = get_llm_config()
     agent_types = ["researcher", "planner", "executor", "reviewer"]
     
     test_message = [
         {"role": "user", "content": "请简要说明你的作用"}
     ]
     
-    for agent_type in agent_types:
-        try:
-            print(f"\n🔧 测试 {agent_type} 参数...")
-            start_time = time.time()
-            
-            response = config.call_llm(test_message, agent_type=agent_type)
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
-            
-            print(f"✅ 成功 (耗时: {execution_time:.2f}秒)")
-            print(f"📝 响应预览: {response[:100]}...")
-            
-        except Exception as e:
-            end_time = time.time()
-            execution_time = end_time - start_time
-            print(f"❌ 失败 (耗时: {execution_time:.2f}秒): {e}")
+    sem = asyncio.Semaphore(TEST_CONCURRENCY)
+    results = await asyncio.gather(*(
+        _timed_call(sem, config, test_message, agent_type=agent_type)
+        for agent_type in agent_types
+    ))
+    
+    for agent_type, (response, execution_time, error) in zip(agent_types, results):
+        print(f"\n🔧 测试 {agent_type} 参数...")
+        
+        if error is not None:
+            print(f"❌ 失败 (耗时: {execution_time:.2f}秒): {error}")
+            continue
+        
+        print(f"✅ 成功 (耗时: {execution_time:.2f}秒)")
+        print(f"📝 响应预览: {response[:100]}...")
 
 def test_concurrent_requests():
     """测试并发请求"""
     print("\n⚡ 测试并发请求性能...")
     
-    import asyncio
-    import aiohttp
-    
     async def make_request(session, config, request_id):
         """发送单个异步请求"""
         try:
@@ -142,8 +160,7 @@ def test_concurrent_requests():
             async with session.post(
                 config.get_chat_url(),
                 headers=config.get_headers(),
-                json=request_data,
-                timeout=aiohttp.ClientTimeout(total=60)
+                json=request_data
             ) as response:
                 result = await response.json()
                 end_time = time.time()
@@ -172,28 +189,33 @@ def test_concurrent_requests():
             }
     
     async def run_concurrent_test():
-        config = LLMConfig()
+        config = get_llm_config()
         
-        async with aiohttp.ClientSession() as session:
+        # 会话绑定在本次事件循环上，测试内的所有请求复用同一个连接池和keep-alive连接
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, keepalive_timeout=60)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as session:
             # 并发3个请求
             tasks = [make_request(session, config, i) for i in range(3)]
             
             start_time = time.time()
             results = await asyncio.gather(*tasks)
             end_time = time.time()
-            
-            print(f"🏁 并发测试完成 (总耗时: {end_time - start_time:.2f}秒)")
-            
-            success_count = sum(1 for r in results if r["success"])
-            print(f"📊 成功率: {success_count}/{len(results)}")
-            
-            for result in results:
-                status = "✅" if result["success"] else "❌"
-                print(f"{status} 请求{result['id']}: {result['time']:.2f}秒")
-                if result["success"]:
-                    print(f"   响应: {result['content']}...")
-                else:
-                    print(f"   错误: {result['error']}")
+        
+        print(f"🏁 并发测试完成 (总耗时: {end_time - start_time:.2f}秒)")
+        
+        success_count = sum(1 for r in results if r["success"])
+        print(f"📊 成功率: {success_count}/{len(results)}")
+        
+        for result in results:
+            status = "✅" if result["success"] else "❌"
+            print(f"{status} 请求{result['id']}: {result['time']:.2f}秒")
+            if result["success"]:
+                print(f"   响应: {result['content']}...")
+            else:
+                print(f"   错误: {result['error']}")
     
     try:
         asyncio.run(run_concurrent_test())
@@ -216,16 +238,15 @@ def main():
         return
     
     # 性能测试
-    test_different_token_limits()
+    asyncio.run(test_different_token_limits())
     
     # Agent参数测试
-    test_agent_specific_params()
+    asyncio.run(test_agent_specific_params())
     
     # 并发测试（可选）
-    try:
-        import aiohttp
+    if aiohttp is not None:
         test_concurrent_requests()
-    except ImportError:
+    else:
         print("\n⚠️  跳过并发测试 (需要安装 aiohttp: pip install aiohttp)")
     
     print("\n" + "=" * 50)